@@ -0,0 +1,2 @@
+wokkel.pubsub.PubSubClient.createNode now also accepts a prepared
+node configuration submit form as `options`, sending it as is.
@@ -773,15 +773,25 @@ class PubSubClient(XMPPHandler):
         @type service: L{JID<twisted.words.protocols.jabber.jid.JID>}
         @param nodeIdentifier: Optional suggestion for the id of the node.
         @type nodeIdentifier: L{unicode}
-        @param options: Optional node configuration options.
-        @type options: L{dict}
+        @param options: Optional node configuration options. A prepared
+            form is sent as is, and must be a submit form in the
+            C{NS_PUBSUB_NODE_CONFIG} namespace.
+        @type options: L{dict} or L{data_form.Form}
+        @raise ValueError: If C{options} is a form of another type or
+            namespace.
         """
         request = PubSubRequest('create')
         request.recipient = service
         request.nodeIdentifier = nodeIdentifier
         request.sender = sender
 
-        if options:
+        if isinstance(options, data_form.Form):
+            if (options.formType != 'submit' or
+                options.formNamespace != NS_PUBSUB_NODE_CONFIG):
+                raise ValueError("Expected a submit form in the %r namespace"
+                                 % NS_PUBSUB_NODE_CONFIG)
+            request.options = options
+        elif options:
             form = data_form.Form(formType='submit',
                                   formNamespace=NS_PUBSUB_NODE_CONFIG)
             form.makeFields(options)
@@ -9,7 +9,7 @@ from __future__ import division, absolute_import
 
 from twisted.internet import defer
 from twisted.python.compat import iteritems
-from twisted.words.xish import xpath
+from twisted.words.xish import domish, xpath
 from twisted.words.xish.utility import EventDispatcher
 
 from wokkel.generic import parseXml
@@ -78,14 +78,18 @@ class TestableRequestHandlerMixin(object):
         """
         Find a handler and call it directly.
 
-        @param xml: XML stanza that may yield a handler being called.
-        @type xml: C{str}.
+        @param xml: XML stanza that may yield a handler being called. A
+                    pre-built element is used as is, without parsing.
+        @type xml: C{str} or L{domish.Element}.
         @return: Deferred that fires with the result of a handler for this
                  stanza. If no handler was found, the deferred has its errback
                  called with a C{NotImplementedError} exception.
         """
         handler = None
-        iq = parseXml(xml)
+        if domish.IElement.providedBy(xml):
+            iq = xml
+        else:
+            iq = parseXml(xml)
         for queryString, method in iteritems(self.service.iqHandlers):
             if xpath.internQuery(queryString).matches(iq):
                 handler = getattr(self.service, method)
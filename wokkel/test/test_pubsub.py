@@ -7,10 +7,13 @@ Tests for L{wokkel.pubsub}
 
 from __future__ import division, absolute_import
 
+import copy
+
 from zope.interface import verify
 
 from twisted.trial import unittest
 from twisted.internet import defer
+from twisted.python.compat import iteritems, unicode
 from twisted.words.xish import domish
 from twisted.words.protocols.jabber import error
 from twisted.words.protocols.jabber.jid import JID
@@ -28,6 +31,32 @@ NS_PUBSUB_OWNER = 'http://jabber.org/protocol/pubsub#owner'
 NS_PUBSUB_META_DATA = 'http://jabber.org/protocol/pubsub#meta-data'
 NS_PUBSUB_SUBSCRIBE_OPTIONS = 'http://jabber.org/protocol/pubsub#subscribe_options'
 
+_PUBSUB_JID = JID('pubsub.example.org')
+_USER_JID = JID('user@example.org')
+_HOME_JID = JID('user@example.org/Home')
+
+_CREATE_OPTIONS = {
+    'pubsub#title': 'Princely Musings (Atom)',
+    'pubsub#deliver_payloads': True,
+    'pubsub#persist_items': '1',
+    'pubsub#max_items': '10',
+    'pubsub#access_model': 'open',
+    'pubsub#type': 'http://www.w3.org/2005/Atom',
+}
+
+# Node configuration field definitions, as returned by a resource's
+# getConfigurationOptions. Shared between tests, so tests pass a deep copy to
+# the code under test: data_form.Form.typeCheck fills in a missing field type.
+_NODE_CONFIG_OPTIONS = {
+    "pubsub#persist_items":
+        {"type": "boolean",
+         "label": "Persist items to storage"},
+    "pubsub#deliver_payloads":
+        {"type": "boolean",
+         "label": "Deliver payloads with event notifications"}
+}
+
+
 def calledAsync(fn):
     """
     Function wrapper that fires a deferred upon calling the given function.
@@ -45,6 +74,128 @@ def calledAsync(fn):
     return d, func
 
 
+def _single(elements):
+    """
+    Return the one and only element yielded by an iterable.
+
+    This is used instead of materializing the result of
+    L{domish.generateElementsQNamed} into a list, when a test expects exactly
+    one matching child.
+
+    @raise unittest.FailTest: If C{elements} does not yield exactly one
+        element.
+    """
+    elements = iter(elements)
+    try:
+        first = next(elements)
+    except StopIteration:
+        raise unittest.FailTest("Expected exactly one element, got none")
+
+    if next(elements, None) is not None:
+        raise unittest.FailTest("Expected exactly one element, got more")
+
+    return first
+
+
+def _makeIQ(stanzaType, childName, namespace=NS_PUBSUB, form=None,
+            **attributes):
+    """
+    Build a publish-subscribe request from the test user to the test service.
+
+    This builds the DOM directly, for tests that don't need the request to
+    go through the XML parser.
+
+    @param stanzaType: The iq type, C{'get'} or C{'set'}.
+    @type stanzaType: L{str}
+    @param childName: Name of the verb element in the C{pubsub} element.
+    @type childName: L{str}
+    @param namespace: Namespace of the C{pubsub} element.
+    @type namespace: L{str}
+    @param form: Optional form to render into the verb element.
+    @type form: L{data_form.Form}
+    @param attributes: Attributes of the verb element.
+    @rtype: L{domish.Element}
+    """
+    iq = domish.Element((None, 'iq'))
+    iq['type'] = stanzaType
+    iq['to'] = 'pubsub.example.org'
+    iq['from'] = 'user@example.org'
+    verbElement = iq.addElement((namespace, 'pubsub')).addElement(childName)
+    for name, value in iteritems(attributes):
+        verbElement[name] = value
+    if form is not None:
+        verbElement.addChild(form.toElement())
+    return iq
+
+
+def _iq(body, stanzaType='set', namespace=NS_PUBSUB):
+    """
+    Wrap serialized verb elements in a request to the test service.
+
+    @param body: Serialized children of the C{pubsub} element.
+    @type body: L{unicode}
+    @param stanzaType: The iq type, C{'get'} or C{'set'}.
+    @type stanzaType: L{str}
+    @param namespace: Namespace of the C{pubsub} element.
+    @type namespace: L{str}
+    @return: The serialized request, from the test user.
+    @rtype: L{unicode}
+    """
+    return ("<iq type='%s' to='pubsub.example.org' from='user@example.org'>"
+            "<pubsub xmlns='%s'>%s</pubsub></iq>") % (stanzaType, namespace,
+                                                      body)
+
+
+def _deliverForm():
+    """
+    Create a submitted subscription options form that enables delivery.
+    """
+    form = data_form.Form('submit', formNamespace=NS_PUBSUB_SUBSCRIBE_OPTIONS)
+    form.addField(data_form.Field(None, var='pubsub#deliver', value='1'))
+    return form
+
+
+def _discoInfo(info):
+    """
+    Collect the items returned by C{getDiscoInfo} into a L{disco.DiscoInfo}.
+
+    This allows for membership checks on its C{identities}, C{features} and
+    C{extensions}.
+    """
+    discoInfo = disco.DiscoInfo()
+    for item in info:
+        discoInfo.append(item)
+    return discoInfo
+
+
+def _formValues(element):
+    """
+    Return the raw field values of a rendered data form.
+
+    This reads the values straight from the DOM, as sent, without going
+    through L{data_form.Form}.
+
+    @param element: The C{x} element of the form.
+    @type element: L{domish.Element}
+    @return: Mapping of field names to their (first) value.
+    @rtype: L{dict}
+    """
+    return dict((field['var'], unicode(field.value))
+                for field in element.elements(data_form.NS_X_DATA, 'field'))
+
+
+def _newMessage():
+    """
+    Create a message from the test service to the test user.
+
+    This is the common envelope for the publish-subscribe event tests.
+    """
+    message = domish.Element((None, 'message'))
+    message['from'] = 'pubsub.example.org'
+    message['to'] = 'user@example.org/home'
+    return message
+
+
 class SubscriptionTest(unittest.TestCase):
     """
     Tests for L{pubsub.Subscription}.
@@ -60,9 +211,9 @@ class SubscriptionTest(unittest.TestCase):
         """
         subscription = pubsub.Subscription.fromElement(parseXml(xml))
         self.assertEqual('test', subscription.nodeIdentifier)
-        self.assertEqual(JID('user@example.org/Home'), subscription.subscriber)
+        self.assertEqual(_HOME_JID, subscription.subscriber)
         self.assertEqual('pending', subscription.state)
-        self.assertIdentical(None, subscription.subscriptionIdentifier)
+        self.assertIsNone(subscription.subscriptionIdentifier)
 
 
     def test_fromElementWithSubscriptionIdentifier(self):
@@ -81,36 +232,30 @@ class SubscriptionTest(unittest.TestCase):
         """
         Rendering a Subscription should yield the proper attributes.
         """
-        subscription = pubsub.Subscription('test',
-                                           JID('user@example.org/Home'),
-                                           'pending')
+        subscription = pubsub.Subscription('test', _HOME_JID, 'pending')
         element = subscription.toElement()
         self.assertEqual('subscription', element.name)
         self.assertEqual(None, element.uri)
-        self.assertEqual('test', element.getAttribute('node'))
-        self.assertEqual('user@example.org/Home', element.getAttribute('jid'))
-        self.assertEqual('pending', element.getAttribute('subscription'))
-        self.assertFalse(element.hasAttribute('subid'))
+        self.assertEqual({'node': 'test',
+                          'jid': 'user@example.org/Home',
+                          'subscription': 'pending'},
+                         element.attributes)
 
 
     def test_toElementEmptyNodeIdentifier(self):
         """
         The empty node identifier should not yield a node attribute.
         """
-        subscription = pubsub.Subscription('',
-                                           JID('user@example.org/Home'),
-                                           'pending')
+        subscription = pubsub.Subscription('', _HOME_JID, 'pending')
         element = subscription.toElement()
-        self.assertFalse(element.hasAttribute('node'))
+        self.assertNotIn('node', element.attributes)
 
 
     def test_toElementWithSubscriptionIdentifier(self):
         """
         The subscription identifier, if set, is in the subid attribute.
         """
-        subscription = pubsub.Subscription('test',
-                                           JID('user@example.org/Home'),
-                                           'pending',
+        subscription = pubsub.Subscription('test', _HOME_JID, 'pending',
                                            subscriptionIdentifier='1234')
         element = subscription.toElement()
         self.assertEqual('1234', element.getAttribute('subid'))
@@ -151,6 +296,105 @@ class PubSubClientTest(unittest.TestCase):
         self.protocol.connectionInitialized()
 
 
+    def _expectIq(self, to, type_, ns, childName, **attrs):
+        """
+        Check the last sent request and return it with its verb element.
+
+        @param to: Expected addressee of the request.
+        @param type_: Expected iq type, C{'get'} or C{'set'}.
+        @param ns: Expected namespace of the C{pubsub} element.
+        @param childName: Name of the single expected verb element.
+        @param attrs: Expected attributes of the verb element.
+        @return: Tuple of the iq and its verb element.
+        """
+        iq = self.stub.output[-1]
+        self.assertEqual(to, iq.getAttribute('to'))
+        self.assertEqual(type_, iq.getAttribute('type'))
+        self.assertEqual('pubsub', iq.pubsub.name)
+        self.assertEqual(ns, iq.pubsub.uri)
+        child = _single(domish.generateElementsQNamed(iq.pubsub.children,
+                                                      childName, ns))
+        for name, value in iteritems(attrs):
+            self.assertEqual(value, child[name])
+        return iq, child
+
+
+    def _respond(self, iq, build=None):
+        """
+        Send a result response to a request.
+
+        @param iq: The request to respond to.
+        @param build: Optional callable that is passed the response, to add
+            a payload to it.
+        """
+        response = toResponse(iq, 'result')
+        if build is not None:
+            build(response)
+        self.stub.send(response)
+
+
+    def _respondSubscription(self, iq, state, subscriptionIdentifier=None):
+        """
+        Send a result response to a subscribe request.
+
+        @param state: The subscription state to respond with.
+        @param subscriptionIdentifier: Optional subscription identifier.
+        """
+        def build(response):
+            pubsub = response.addElement((NS_PUBSUB, 'pubsub'))
+            subscription = pubsub.addElement('subscription')
+            subscription['node'] = 'test'
+            subscription['jid'] = 'user@example.org'
+            subscription['subscription'] = state
+            if subscriptionIdentifier:
+                subscription['subid'] = subscriptionIdentifier
+
+        self._respond(iq, build)
+
+
+    def _respondItems(self, iq, itemIdentifiers=()):
+        """
+        Send a result response to an items request.
+
+        @param itemIdentifiers: Identifiers of the items to respond with.
+        @return: The item elements in the response.
+        @rtype: L{list} of L{domish.Element}
+        """
+        itemElements = []
+
+        def build(response):
+            pubsub = response.addElement((NS_PUBSUB, 'pubsub'))
+            items = pubsub.addElement('items')
+            items['node'] = 'test'
+            for itemIdentifier in itemIdentifiers:
+                item = items.addElement('item')
+                item['id'] = itemIdentifier
+                itemElements.append(item)
+
+        self._respond(iq, build)
+        return itemElements
+
+
+    def _respondOptions(self, iq):
+        """
+        Send a result response with an options form to an options request.
+
+        The form has a single boolean field C{pubsub#deliver}, set to
+        L{True}.
+        """
+        form = data_form.Form('form', formNamespace=NS_PUBSUB_SUBSCRIBE_OPTIONS)
+        form.addField(data_form.Field('boolean', var='pubsub#deliver',
+                                                 label='Enable delivery?',
+                                                 value=True))
+
+        def build(response):
+            pubsub = response.addElement((NS_PUBSUB, 'pubsub'))
+            options = pubsub.addElement('options')
+            options.addChild(form.toElement())
+
+        self._respond(iq, build)
+
+
     def test_interface(self):
         """
         Do instances of L{pubsub.PubSubClient} provide L{iwokkel.IPubSubClient}?
@@ -162,9 +406,7 @@ class PubSubClientTest(unittest.TestCase):
         """
         Test receiving an items event resulting in a call to itemsReceived.
         """
-        message = domish.Element((None, 'message'))
-        message['from'] = 'pubsub.example.org'
-        message['to'] = 'user@example.org/home'
+        message = _newMessage()
         event = message.addElement((NS_PUBSUB_EVENT, 'event'))
         items = event.addElement('items')
         items['node'] = 'test'
@@ -176,10 +418,10 @@ class PubSubClientTest(unittest.TestCase):
         item3['id'] = 'item3'
 
         def itemsReceived(event):
-            self.assertEquals(JID('user@example.org/home'), event.recipient)
-            self.assertEquals(JID('pubsub.example.org'), event.sender)
-            self.assertEquals('test', event.nodeIdentifier)
-            self.assertEquals([item1, item2, item3], event.items)
+            self.assertEqual(JID('user@example.org/home'), event.recipient)
+            self.assertEqual(_PUBSUB_JID, event.sender)
+            self.assertEqual('test', event.nodeIdentifier)
+            self.assertEqual([item1, item2, item3], event.items)
 
         d, self.protocol.itemsReceived = calledAsync(itemsReceived)
         self.stub.send(message)
@@ -190,9 +432,7 @@ class PubSubClientTest(unittest.TestCase):
         """
         Test receiving an items event resulting in a call to itemsReceived.
         """
-        message = domish.Element((None, 'message'))
-        message['from'] = 'pubsub.example.org'
-        message['to'] = 'user@example.org/home'
+        message = _newMessage()
         event = message.addElement((NS_PUBSUB_EVENT, 'event'))
         items = event.addElement('items')
         items['node'] = 'test'
@@ -201,10 +441,10 @@ class PubSubClientTest(unittest.TestCase):
         message.addChild(headers)
 
         def itemsReceived(event):
-            self.assertEquals(JID('user@example.org/home'), event.recipient)
-            self.assertEquals(JID('pubsub.example.org'), event.sender)
-            self.assertEquals('test', event.nodeIdentifier)
-            self.assertEquals({'Collection': ['collection']}, event.headers)
+            self.assertEqual(JID('user@example.org/home'), event.recipient)
+            self.assertEqual(_PUBSUB_JID, event.sender)
+            self.assertEqual('test', event.nodeIdentifier)
+            self.assertEqual({'Collection': ['collection']}, event.headers)
 
         d, self.protocol.itemsReceived = calledAsync(itemsReceived)
         self.stub.send(message)
@@ -218,9 +458,7 @@ class PubSubClientTest(unittest.TestCase):
         This test uses an items event, which should not result in itemsReceived
         being called. In general message.handled should be False.
         """
-        message = domish.Element((None, 'message'))
-        message['from'] = 'pubsub.example.org'
-        message['to'] = 'user@example.org/home'
+        message = _newMessage()
         message['type'] = 'error'
         event = message.addElement((NS_PUBSUB_EVENT, 'event'))
         items = event.addElement('items')
@@ -241,17 +479,15 @@ class PubSubClientTest(unittest.TestCase):
         """
         Test receiving a delete event resulting in a call to deleteReceived.
         """
-        message = domish.Element((None, 'message'))
-        message['from'] = 'pubsub.example.org'
-        message['to'] = 'user@example.org/home'
+        message = _newMessage()
         event = message.addElement((NS_PUBSUB_EVENT, 'event'))
         delete = event.addElement('delete')
         delete['node'] = 'test'
 
         def deleteReceived(event):
-            self.assertEquals(JID('user@example.org/home'), event.recipient)
-            self.assertEquals(JID('pubsub.example.org'), event.sender)
-            self.assertEquals('test', event.nodeIdentifier)
+            self.assertEqual(JID('user@example.org/home'), event.recipient)
+            self.assertEqual(_PUBSUB_JID, event.sender)
+            self.assertEqual('test', event.nodeIdentifier)
 
         d, self.protocol.deleteReceived = calledAsync(deleteReceived)
         self.stub.send(message)
@@ -262,9 +498,7 @@ class PubSubClientTest(unittest.TestCase):
         """
         Test receiving a delete event with a redirect URI.
         """
-        message = domish.Element((None, 'message'))
-        message['from'] = 'pubsub.example.org'
-        message['to'] = 'user@example.org/home'
+        message = _newMessage()
         event = message.addElement((NS_PUBSUB_EVENT, 'event'))
         delete = event.addElement('delete')
         delete['node'] = 'test'
@@ -272,10 +506,10 @@ class PubSubClientTest(unittest.TestCase):
         delete.addElement('redirect')['uri'] = uri
 
         def deleteReceived(event):
-            self.assertEquals(JID('user@example.org/home'), event.recipient)
-            self.assertEquals(JID('pubsub.example.org'), event.sender)
-            self.assertEquals('test', event.nodeIdentifier)
-            self.assertEquals(uri, event.redirectURI)
+            self.assertEqual(JID('user@example.org/home'), event.recipient)
+            self.assertEqual(_PUBSUB_JID, event.sender)
+            self.assertEqual('test', event.nodeIdentifier)
+            self.assertEqual(uri, event.redirectURI)
 
         d, self.protocol.deleteReceived = calledAsync(deleteReceived)
         self.stub.send(message)
@@ -286,17 +520,15 @@ class PubSubClientTest(unittest.TestCase):
         """
         Test receiving a purge event resulting in a call to purgeReceived.
         """
-        message = domish.Element((None, 'message'))
-        message['from'] = 'pubsub.example.org'
-        message['to'] = 'user@example.org/home'
+        message = _newMessage()
         event = message.addElement((NS_PUBSUB_EVENT, 'event'))
         items = event.addElement('purge')
         items['node'] = 'test'
 
         def purgeReceived(event):
-            self.assertEquals(JID('user@example.org/home'), event.recipient)
-            self.assertEquals(JID('pubsub.example.org'), event.sender)
-            self.assertEquals('test', event.nodeIdentifier)
+            self.assertEqual(JID('user@example.org/home'), event.recipient)
+            self.assertEqual(_PUBSUB_JID, event.sender)
+            self.assertEqual('test', event.nodeIdentifier)
 
         d, self.protocol.purgeReceived = calledAsync(purgeReceived)
         self.stub.send(message)
@@ -309,24 +541,15 @@ class PubSubClientTest(unittest.TestCase):
         """
 
         def cb(nodeIdentifier):
-            self.assertEquals('test', nodeIdentifier)
+            self.assertEqual('test', nodeIdentifier)
 
-        d = self.protocol.createNode(JID('pubsub.example.org'), 'test')
+        d = self.protocol.createNode(_PUBSUB_JID, 'test')
         d.addCallback(cb)
 
-        iq = self.stub.output[-1]
-        self.assertEquals('pubsub.example.org', iq.getAttribute('to'))
-        self.assertEquals('set', iq.getAttribute('type'))
-        self.assertEquals('pubsub', iq.pubsub.name)
-        self.assertEquals(NS_PUBSUB, iq.pubsub.uri)
-        children = list(domish.generateElementsQNamed(iq.pubsub.children,
-                                                      'create', NS_PUBSUB))
-        self.assertEquals(1, len(children))
-        child = children[0]
-        self.assertEquals('test', child['node'])
+        iq, child = self._expectIq('pubsub.example.org', 'set', NS_PUBSUB,
+                                   'create', node='test')
 
-        response = toResponse(iq, 'result')
-        self.stub.send(response)
+        self._respond(iq)
         return d
 
 
@@ -336,22 +559,22 @@ class PubSubClientTest(unittest.TestCase):
         """
 
         def cb(nodeIdentifier):
-            self.assertEquals('test', nodeIdentifier)
+            self.assertEqual('test', nodeIdentifier)
 
-        d = self.protocol.createNode(JID('pubsub.example.org'))
+        d = self.protocol.createNode(_PUBSUB_JID)
         d.addCallback(cb)
 
         iq = self.stub.output[-1]
-        children = list(domish.generateElementsQNamed(iq.pubsub.children,
+        child = _single(domish.generateElementsQNamed(iq.pubsub.children,
                                                       'create', NS_PUBSUB))
-        child = children[0]
         self.assertFalse(child.hasAttribute('node'))
 
-        response = toResponse(iq, 'result')
-        command = response.addElement((NS_PUBSUB, 'pubsub'))
-        create = command.addElement('create')
-        create['node'] = 'test'
-        self.stub.send(response)
+        def build(response):
+            command = response.addElement((NS_PUBSUB, 'pubsub'))
+            create = command.addElement('create')
+            create['node'] = 'test'
+
+        self._respond(iq, build)
         return d
 
 
@@ -361,22 +584,22 @@ class PubSubClientTest(unittest.TestCase):
         """
 
         def cb(nodeIdentifier):
-            self.assertEquals('test2', nodeIdentifier)
+            self.assertEqual('test2', nodeIdentifier)
 
-        d = self.protocol.createNode(JID('pubsub.example.org'), 'test')
+        d = self.protocol.createNode(_PUBSUB_JID, 'test')
         d.addCallback(cb)
 
         iq = self.stub.output[-1]
-        children = list(domish.generateElementsQNamed(iq.pubsub.children,
+        child = _single(domish.generateElementsQNamed(iq.pubsub.children,
                                                       'create', NS_PUBSUB))
-        child = children[0]
-        self.assertEquals('test', child['node'])
+        self.assertEqual('test', child['node'])
 
-        response = toResponse(iq, 'result')
-        command = response.addElement((NS_PUBSUB, 'pubsub'))
-        create = command.addElement('create')
-        create['node'] = 'test2'
-        self.stub.send(response)
+        def build(response):
+            command = response.addElement((NS_PUBSUB, 'pubsub'))
+            create = command.addElement('create')
+            create['node'] = 'test2'
+
+        self._respond(iq, build)
         return d
 
 
@@ -385,14 +608,12 @@ class PubSubClientTest(unittest.TestCase):
         Test sending create request from a specific JID.
         """
 
-        d = self.protocol.createNode(JID('pubsub.example.org'), 'test',
-                                     sender=JID('user@example.org'))
+        d = self.protocol.createNode(_PUBSUB_JID, 'test', sender=_USER_JID)
 
         iq = self.stub.output[-1]
-        self.assertEquals('user@example.org', iq['from'])
+        self.assertEqual('user@example.org', iq['from'])
 
-        response = toResponse(iq, 'result')
-        self.stub.send(response)
+        self._respond(iq)
         return d
 
 
@@ -401,56 +622,92 @@ class PubSubClientTest(unittest.TestCase):
         Test sending create request with configuration options
         """
 
-        options = {
-            'pubsub#title': 'Princely Musings (Atom)',
-            'pubsub#deliver_payloads': True,
-            'pubsub#persist_items': '1',
-            'pubsub#max_items': '10',
-            'pubsub#access_model': 'open',
-            'pubsub#type': 'http://www.w3.org/2005/Atom',
-        }
-
-        d = self.protocol.createNode(JID('pubsub.example.org'), 'test',
-                                     sender=JID('user@example.org'),
-                                     options=options)
+        d = self.protocol.createNode(_PUBSUB_JID, 'test',
+                                     sender=_USER_JID,
+                                     options=_CREATE_OPTIONS)
 
         iq = self.stub.output[-1]
 
         # check if there is exactly one configure element
-        children = list(domish.generateElementsQNamed(iq.pubsub.children,
-                                                      'configure', NS_PUBSUB))
-        self.assertEqual(1, len(children))
+        configure = _single(domish.generateElementsQNamed(iq.pubsub.children,
+                                                          'configure',
+                                                          NS_PUBSUB))
 
         # check that it has a configuration form
-        form = data_form.findForm(children[0], NS_PUBSUB_NODE_CONFIG)
+        form = data_form.findForm(configure, NS_PUBSUB_NODE_CONFIG)
         self.assertEqual('submit', form.formType)
+        self.assertEqual(set(_CREATE_OPTIONS), set(form.fields))
 
+        self._respond(iq)
+        return d
 
-        response = toResponse(iq, 'result')
-        self.stub.send(response)
+
+    def test_createNodeWithConfigForm(self):
+        """
+        A prepared configuration form is sent without conversion.
+
+        Field types set on the form are kept, where a dict of options would
+        only carry values.
+        """
+        form = data_form.Form(formType='submit',
+                              formNamespace=NS_PUBSUB_NODE_CONFIG)
+        form.addField(data_form.Field('text-multi', var='pubsub#description',
+                                      values=['Princely', 'Musings']))
+
+        d = self.protocol.createNode(_PUBSUB_JID, 'test', options=form)
+
+        iq = self.stub.output[-1]
+        configure = _single(domish.generateElementsQNamed(iq.pubsub.children,
+                                                          'configure',
+                                                          NS_PUBSUB))
+        x = _single(configure.elements(data_form.NS_X_DATA, 'x'))
+        self.assertEqual('submit', x['type'])
+        field = _single(field for field in
+                        x.elements(data_form.NS_X_DATA, 'field')
+                        if field.getAttribute('var') == 'pubsub#description')
+        self.assertEqual('text-multi', field['type'])
+        self.assertEqual(['Princely', 'Musings'],
+                         [unicode(value) for value in
+                          field.elements(data_form.NS_X_DATA, 'value')])
+
+        self._respond(iq)
         return d
 
 
+    def test_createNodeWithConfigFormWrongType(self):
+        """
+        A prepared form that is not a submit form is rejected.
+        """
+        form = data_form.Form(formType='form',
+                              formNamespace=NS_PUBSUB_NODE_CONFIG)
+        self.assertRaises(ValueError, self.protocol.createNode,
+                          _PUBSUB_JID, 'test', options=form)
+        self.assertEqual([], self.stub.output)
+
+
+    def test_createNodeWithConfigFormWrongNamespace(self):
+        """
+        A prepared form in another namespace than node configuration is
+        rejected.
+        """
+        form = data_form.Form(formType='submit',
+                              formNamespace=NS_PUBSUB_SUBSCRIBE_OPTIONS)
+        self.assertRaises(ValueError, self.protocol.createNode,
+                          _PUBSUB_JID, 'test', options=form)
+        self.assertEqual([], self.stub.output)
+
+
     def test_deleteNode(self):
         """
         Test sending delete request.
         """
 
-        d = self.protocol.deleteNode(JID('pubsub.example.org'), 'test')
+        d = self.protocol.deleteNode(_PUBSUB_JID, 'test')
 
-        iq = self.stub.output[-1]
-        self.assertEquals('pubsub.example.org', iq.getAttribute('to'))
-        self.assertEquals('set', iq.getAttribute('type'))
-        self.assertEquals('pubsub', iq.pubsub.name)
-        self.assertEquals(NS_PUBSUB_OWNER, iq.pubsub.uri)
-        children = list(domish.generateElementsQNamed(iq.pubsub.children,
-                                                      'delete', NS_PUBSUB_OWNER))
-        self.assertEquals(1, len(children))
-        child = children[0]
-        self.assertEquals('test', child['node'])
+        iq, child = self._expectIq('pubsub.example.org', 'set',
+                                   NS_PUBSUB_OWNER, 'delete', node='test')
 
-        response = toResponse(iq, 'result')
-        self.stub.send(response)
+        self._respond(iq)
         return d
 
 
@@ -459,14 +716,12 @@ class PubSubClientTest(unittest.TestCase):
         Test sending delete request.
         """
 
-        d = self.protocol.deleteNode(JID('pubsub.example.org'), 'test',
-                                     sender=JID('user@example.org'))
+        d = self.protocol.deleteNode(_PUBSUB_JID, 'test', sender=_USER_JID)
 
         iq = self.stub.output[-1]
-        self.assertEquals('user@example.org', iq['from'])
+        self.assertEqual('user@example.org', iq['from'])
 
-        response = toResponse(iq, 'result')
-        self.stub.send(response)
+        self._respond(iq)
         return d
 
 
@@ -476,25 +731,15 @@ class PubSubClientTest(unittest.TestCase):
         """
 
         item = pubsub.Item()
-        d = self.protocol.publish(JID('pubsub.example.org'), 'test', [item])
+        d = self.protocol.publish(_PUBSUB_JID, 'test', [item])
 
-        iq = self.stub.output[-1]
-        self.assertEquals('pubsub.example.org', iq.getAttribute('to'))
-        self.assertEquals('set', iq.getAttribute('type'))
-        self.assertEquals('pubsub', iq.pubsub.name)
-        self.assertEquals(NS_PUBSUB, iq.pubsub.uri)
-        children = list(domish.generateElementsQNamed(iq.pubsub.children,
-                                                      'publish', NS_PUBSUB))
-        self.assertEquals(1, len(children))
-        child = children[0]
-        self.assertEquals('test', child['node'])
-        items = list(domish.generateElementsQNamed(child.children,
-                                                   'item', NS_PUBSUB))
-        self.assertEquals(1, len(items))
-        self.assertIdentical(item, items[0])
+        iq, child = self._expectIq('pubsub.example.org', 'set', NS_PUBSUB,
+                                   'publish', node='test')
+        self.assertIdentical(item,
+                             _single(domish.generateElementsQNamed(
+                                 child.children, 'item', NS_PUBSUB)))
 
-        response = toResponse(iq, 'result')
-        self.stub.send(response)
+        self._respond(iq)
         return d
 
 
@@ -503,21 +748,12 @@ class PubSubClientTest(unittest.TestCase):
         Test sending publish request without items.
         """
 
-        d = self.protocol.publish(JID('pubsub.example.org'), 'test')
+        d = self.protocol.publish(_PUBSUB_JID, 'test')
 
-        iq = self.stub.output[-1]
-        self.assertEquals('pubsub.example.org', iq.getAttribute('to'))
-        self.assertEquals('set', iq.getAttribute('type'))
-        self.assertEquals('pubsub', iq.pubsub.name)
-        self.assertEquals(NS_PUBSUB, iq.pubsub.uri)
-        children = list(domish.generateElementsQNamed(iq.pubsub.children,
-                                                      'publish', NS_PUBSUB))
-        self.assertEquals(1, len(children))
-        child = children[0]
-        self.assertEquals('test', child['node'])
+        iq, child = self._expectIq('pubsub.example.org', 'set', NS_PUBSUB,
+                                   'publish', node='test')
 
-        response = toResponse(iq, 'result')
-        self.stub.send(response)
+        self._respond(iq)
         return d
 
 
@@ -527,14 +763,12 @@ class PubSubClientTest(unittest.TestCase):
         """
 
         item = pubsub.Item()
-        d = self.protocol.publish(JID('pubsub.example.org'), 'test', [item],
-                                  JID('user@example.org'))
+        d = self.protocol.publish(_PUBSUB_JID, 'test', [item], _USER_JID)
 
         iq = self.stub.output[-1]
-        self.assertEquals('user@example.org', iq['from'])
+        self.assertEqual('user@example.org', iq['from'])
 
-        response = toResponse(iq, 'result')
-        self.stub.send(response)
+        self._respond(iq)
         return d
 
 
@@ -542,28 +776,13 @@ class PubSubClientTest(unittest.TestCase):
         """
         Test sending subscription request.
         """
-        d = self.protocol.subscribe(JID('pubsub.example.org'), 'test',
-                                      JID('user@example.org'))
+        d = self.protocol.subscribe(_PUBSUB_JID, 'test', _USER_JID)
 
-        iq = self.stub.output[-1]
-        self.assertEquals('pubsub.example.org', iq.getAttribute('to'))
-        self.assertEquals('set', iq.getAttribute('type'))
-        self.assertEquals('pubsub', iq.pubsub.name)
-        self.assertEquals(NS_PUBSUB, iq.pubsub.uri)
-        children = list(domish.generateElementsQNamed(iq.pubsub.children,
-                                                      'subscribe', NS_PUBSUB))
-        self.assertEquals(1, len(children))
-        child = children[0]
-        self.assertEquals('test', child['node'])
-        self.assertEquals('user@example.org', child['jid'])
+        iq, child = self._expectIq('pubsub.example.org', 'set', NS_PUBSUB,
+                                   'subscribe', node='test',
+                                   jid='user@example.org')
 
-        response = toResponse(iq, 'result')
-        pubsub = response.addElement((NS_PUBSUB, 'pubsub'))
-        subscription = pubsub.addElement('subscription')
-        subscription['node'] = 'test'
-        subscription['jid'] = 'user@example.org'
-        subscription['subscription'] = 'subscribed'
-        self.stub.send(response)
+        self._respondSubscription(iq, 'subscribed')
         return d
 
 
@@ -572,21 +791,13 @@ class PubSubClientTest(unittest.TestCase):
         A successful subscription should return a Subscription instance.
         """
         def cb(subscription):
-            self.assertEqual(JID('user@example.org'), subscription.subscriber)
+            self.assertEqual(_USER_JID, subscription.subscriber)
 
-        d = self.protocol.subscribe(JID('pubsub.example.org'), 'test',
-                                      JID('user@example.org'))
+        d = self.protocol.subscribe(_PUBSUB_JID, 'test', _USER_JID)
         d.addCallback(cb)
 
         iq = self.stub.output[-1]
-
-        response = toResponse(iq, 'result')
-        pubsub = response.addElement((NS_PUBSUB, 'pubsub'))
-        subscription = pubsub.addElement('subscription')
-        subscription['node'] = 'test'
-        subscription['jid'] = 'user@example.org'
-        subscription['subscription'] = 'subscribed'
-        self.stub.send(response)
+        self._respondSubscription(iq, 'subscribed')
         return d
 
 
@@ -595,17 +806,10 @@ class PubSubClientTest(unittest.TestCase):
         Test sending subscription request that results in a pending
         subscription.
         """
-        d = self.protocol.subscribe(JID('pubsub.example.org'), 'test',
-                                      JID('user@example.org'))
+        d = self.protocol.subscribe(_PUBSUB_JID, 'test', _USER_JID)
 
         iq = self.stub.output[-1]
-        response = toResponse(iq, 'result')
-        command = response.addElement((NS_PUBSUB, 'pubsub'))
-        subscription = command.addElement('subscription')
-        subscription['node'] = 'test'
-        subscription['jid'] = 'user@example.org'
-        subscription['subscription'] = 'pending'
-        self.stub.send(response)
+        self._respondSubscription(iq, 'pending')
         self.assertFailure(d, pubsub.SubscriptionPending)
         return d
 
@@ -615,17 +819,10 @@ class PubSubClientTest(unittest.TestCase):
         Test sending subscription request that results in an unconfigured
         subscription.
         """
-        d = self.protocol.subscribe(JID('pubsub.example.org'), 'test',
-                                      JID('user@example.org'))
+        d = self.protocol.subscribe(_PUBSUB_JID, 'test', _USER_JID)
 
         iq = self.stub.output[-1]
-        response = toResponse(iq, 'result')
-        command = response.addElement((NS_PUBSUB, 'pubsub'))
-        subscription = command.addElement('subscription')
-        subscription['node'] = 'test'
-        subscription['jid'] = 'user@example.org'
-        subscription['subscription'] = 'unconfigured'
-        self.stub.send(response)
+        self._respondSubscription(iq, 'unconfigured')
         self.assertFailure(d, pubsub.SubscriptionUnconfigured)
         return d
 
@@ -633,8 +830,7 @@ class PubSubClientTest(unittest.TestCase):
     def test_subscribeWithOptions(self):
         options = {'pubsub#deliver': False}
 
-        d = self.protocol.subscribe(JID('pubsub.example.org'), 'test',
-                                    JID('user@example.org'),
+        d = self.protocol.subscribe(_PUBSUB_JID, 'test', _USER_JID,
                                     options=options)
         iq = self.stub.output[-1]
 
@@ -652,13 +848,7 @@ class PubSubClientTest(unittest.TestCase):
         self.assertEqual(options, form.getValues())
 
         # Send response
-        response = toResponse(iq, 'result')
-        pubsub = response.addElement((NS_PUBSUB, 'pubsub'))
-        subscription = pubsub.addElement('subscription')
-        subscription['node'] = 'test'
-        subscription['jid'] = 'user@example.org'
-        subscription['subscription'] = 'subscribed'
-        self.stub.send(response)
+        self._respondSubscription(iq, 'subscribed')
 
         return d
 
@@ -667,20 +857,13 @@ class PubSubClientTest(unittest.TestCase):
         """
         Test sending subscription request from a specific JID.
         """
-        d = self.protocol.subscribe(JID('pubsub.example.org'), 'test',
-                                      JID('user@example.org'),
-                                      sender=JID('user@example.org'))
+        d = self.protocol.subscribe(_PUBSUB_JID, 'test', _USER_JID,
+                                    sender=_USER_JID)
 
         iq = self.stub.output[-1]
-        self.assertEquals('user@example.org', iq['from'])
+        self.assertEqual('user@example.org', iq['from'])
 
-        response = toResponse(iq, 'result')
-        pubsub = response.addElement((NS_PUBSUB, 'pubsub'))
-        subscription = pubsub.addElement('subscription')
-        subscription['node'] = 'test'
-        subscription['jid'] = 'user@example.org'
-        subscription['subscription'] = 'subscribed'
-        self.stub.send(response)
+        self._respondSubscription(iq, 'subscribed')
         return d
 
 
@@ -691,20 +874,12 @@ class PubSubClientTest(unittest.TestCase):
         def cb(subscription):
             self.assertEqual('1234', subscription.subscriptionIdentifier)
 
-        d = self.protocol.subscribe(JID('pubsub.example.org'), 'test',
-                                      JID('user@example.org'))
+        d = self.protocol.subscribe(_PUBSUB_JID, 'test', _USER_JID)
         d.addCallback(cb)
 
         iq = self.stub.output[-1]
-
-        response = toResponse(iq, 'result')
-        pubsub = response.addElement((NS_PUBSUB, 'pubsub'))
-        subscription = pubsub.addElement('subscription')
-        subscription['node'] = 'test'
-        subscription['jid'] = 'user@example.org'
-        subscription['subscription'] = 'subscribed'
-        subscription['subid'] = '1234'
-        self.stub.send(response)
+        self._respondSubscription(iq, 'subscribed',
+                                  subscriptionIdentifier='1234')
         return d
 
 
@@ -712,22 +887,13 @@ class PubSubClientTest(unittest.TestCase):
         """
         Test sending unsubscription request.
         """
-        d = self.protocol.unsubscribe(JID('pubsub.example.org'), 'test',
-                                      JID('user@example.org'))
+        d = self.protocol.unsubscribe(_PUBSUB_JID, 'test', _USER_JID)
 
-        iq = self.stub.output[-1]
-        self.assertEquals('pubsub.example.org', iq.getAttribute('to'))
-        self.assertEquals('set', iq.getAttribute('type'))
-        self.assertEquals('pubsub', iq.pubsub.name)
-        self.assertEquals(NS_PUBSUB, iq.pubsub.uri)
-        children = list(domish.generateElementsQNamed(iq.pubsub.children,
-                                                      'unsubscribe', NS_PUBSUB))
-        self.assertEquals(1, len(children))
-        child = children[0]
-        self.assertEquals('test', child['node'])
-        self.assertEquals('user@example.org', child['jid'])
-
-        self.stub.send(toResponse(iq, 'result'))
+        iq, child = self._expectIq('pubsub.example.org', 'set', NS_PUBSUB,
+                                   'unsubscribe', node='test',
+                                   jid='user@example.org')
+
+        self._respond(iq)
         return d
 
 
@@ -735,13 +901,12 @@ class PubSubClientTest(unittest.TestCase):
         """
         Test sending unsubscription request from a specific JID.
         """
-        d = self.protocol.unsubscribe(JID('pubsub.example.org'), 'test',
-                                      JID('user@example.org'),
-                                      sender=JID('user@example.org'))
+        d = self.protocol.unsubscribe(_PUBSUB_JID, 'test', _USER_JID,
+                                      sender=_USER_JID)
 
         iq = self.stub.output[-1]
-        self.assertEquals('user@example.org', iq['from'])
-        self.stub.send(toResponse(iq, 'result'))
+        self.assertEqual('user@example.org', iq['from'])
+        self._respond(iq)
         return d
 
 
@@ -749,15 +914,14 @@ class PubSubClientTest(unittest.TestCase):
         """
         Test sending unsubscription request with subscription identifier.
         """
-        d = self.protocol.unsubscribe(JID('pubsub.example.org'), 'test',
-                                      JID('user@example.org'),
+        d = self.protocol.unsubscribe(_PUBSUB_JID, 'test', _USER_JID,
                                       subscriptionIdentifier='1234')
 
         iq = self.stub.output[-1]
         child = iq.pubsub.unsubscribe
-        self.assertEquals('1234', child['subid'])
+        self.assertEqual('1234', child['subid'])
 
-        self.stub.send(toResponse(iq, 'result'))
+        self._respond(iq)
         return d
 
 
@@ -766,27 +930,15 @@ class PubSubClientTest(unittest.TestCase):
         Test sending items request.
         """
         def cb(items):
-            self.assertEquals([], items)
+            self.assertEqual([], items)
 
-        d = self.protocol.items(JID('pubsub.example.org'), 'test')
+        d = self.protocol.items(_PUBSUB_JID, 'test')
         d.addCallback(cb)
 
-        iq = self.stub.output[-1]
-        self.assertEquals('pubsub.example.org', iq.getAttribute('to'))
-        self.assertEquals('get', iq.getAttribute('type'))
-        self.assertEquals('pubsub', iq.pubsub.name)
-        self.assertEquals(NS_PUBSUB, iq.pubsub.uri)
-        children = list(domish.generateElementsQNamed(iq.pubsub.children,
-                                                      'items', NS_PUBSUB))
-        self.assertEquals(1, len(children))
-        child = children[0]
-        self.assertEquals('test', child['node'])
-
-        response = toResponse(iq, 'result')
-        items = response.addElement((NS_PUBSUB, 'pubsub')).addElement('items')
-        items['node'] = 'test'
+        iq, child = self._expectIq('pubsub.example.org', 'get', NS_PUBSUB,
+                                   'items', node='test')
 
-        self.stub.send(response)
+        self._respondItems(iq)
 
         return d
 
@@ -795,76 +947,31 @@ class PubSubClientTest(unittest.TestCase):
         """
         Test sending items request, with limit on the number of items.
         """
-        def cb(items):
-            self.assertEquals(2, len(items))
-            self.assertEquals([item1, item2], items)
-
-        d = self.protocol.items(JID('pubsub.example.org'), 'test', maxItems=2)
-        d.addCallback(cb)
-
-        iq = self.stub.output[-1]
-        self.assertEquals('pubsub.example.org', iq.getAttribute('to'))
-        self.assertEquals('get', iq.getAttribute('type'))
-        self.assertEquals('pubsub', iq.pubsub.name)
-        self.assertEquals(NS_PUBSUB, iq.pubsub.uri)
-        children = list(domish.generateElementsQNamed(iq.pubsub.children,
-                                                      'items', NS_PUBSUB))
-        self.assertEquals(1, len(children))
-        child = children[0]
-        self.assertEquals('test', child['node'])
-        self.assertEquals('2', child['max_items'])
+        d = self.protocol.items(_PUBSUB_JID, 'test', maxItems=2)
 
-        response = toResponse(iq, 'result')
-        items = response.addElement((NS_PUBSUB, 'pubsub')).addElement('items')
-        items['node'] = 'test'
-        item1 = items.addElement('item')
-        item1['id'] = 'item1'
-        item2 = items.addElement('item')
-        item2['id'] = 'item2'
-
-        self.stub.send(response)
+        iq, child = self._expectIq('pubsub.example.org', 'get', NS_PUBSUB,
+                                   'items', node='test', max_items='2')
 
-        return d
+        itemElements = self._respondItems(iq, ['item1', 'item2'])
+        self.assertEqual(itemElements, self.successResultOf(d))
 
 
     def test_itemsWithItemIdentifiers(self):
         """
         Test sending items request with item identifiers.
         """
-        def cb(items):
-            self.assertEquals(2, len(items))
-            self.assertEquals([item1, item2], items)
-
-        d = self.protocol.items(JID('pubsub.example.org'), 'test',
+        d = self.protocol.items(_PUBSUB_JID, 'test',
                                 itemIdentifiers=['item1', 'item2'])
-        d.addCallback(cb)
 
-        iq = self.stub.output[-1]
-        self.assertEquals('pubsub.example.org', iq.getAttribute('to'))
-        self.assertEquals('get', iq.getAttribute('type'))
-        self.assertEquals('pubsub', iq.pubsub.name)
-        self.assertEquals(NS_PUBSUB, iq.pubsub.uri)
-        children = list(domish.generateElementsQNamed(iq.pubsub.children,
-                                                      'items', NS_PUBSUB))
-        self.assertEquals(1, len(children))
-        child = children[0]
-        self.assertEquals('test', child['node'])
+        iq, child = self._expectIq('pubsub.example.org', 'get', NS_PUBSUB,
+                                   'items', node='test')
         itemIdentifiers = [item.getAttribute('id') for item in
                            domish.generateElementsQNamed(child.children, 'item',
                                                          NS_PUBSUB)]
-        self.assertEquals(['item1', 'item2'], itemIdentifiers)
-
-        response = toResponse(iq, 'result')
-        items = response.addElement((NS_PUBSUB, 'pubsub')).addElement('items')
-        items['node'] = 'test'
-        item1 = items.addElement('item')
-        item1['id'] = 'item1'
-        item2 = items.addElement('item')
-        item2['id'] = 'item2'
-
-        self.stub.send(response)
+        self.assertEqual(['item1', 'item2'], itemIdentifiers)
 
-        return d
+        itemElements = self._respondItems(iq, ['item1', 'item2'])
+        self.assertEqual(itemElements, self.successResultOf(d))
 
 
     def test_itemsWithSubscriptionIdentifier(self):
@@ -872,18 +979,14 @@ class PubSubClientTest(unittest.TestCase):
         Test sending items request with a subscription identifier.
         """
 
-        d = self.protocol.items(JID('pubsub.example.org'), 'test',
-                               subscriptionIdentifier='1234')
+        d = self.protocol.items(_PUBSUB_JID, 'test',
+                                subscriptionIdentifier='1234')
 
         iq = self.stub.output[-1]
         child = iq.pubsub.items
-        self.assertEquals('1234', child['subid'])
-
-        response = toResponse(iq, 'result')
-        items = response.addElement((NS_PUBSUB, 'pubsub')).addElement('items')
-        items['node'] = 'test'
+        self.assertEqual('1234', child['subid'])
 
-        self.stub.send(response)
+        self._respondItems(iq)
         return d
 
 
@@ -892,59 +995,33 @@ class PubSubClientTest(unittest.TestCase):
         Test sending items request from a specific JID.
         """
 
-        d = self.protocol.items(JID('pubsub.example.org'), 'test',
-                               sender=JID('user@example.org'))
+        d = self.protocol.items(_PUBSUB_JID, 'test', sender=_USER_JID)
 
         iq = self.stub.output[-1]
-        self.assertEquals('user@example.org', iq['from'])
-
-        response = toResponse(iq, 'result')
-        items = response.addElement((NS_PUBSUB, 'pubsub')).addElement('items')
-        items['node'] = 'test'
+        self.assertEqual('user@example.org', iq['from'])
 
-        self.stub.send(response)
+        self._respondItems(iq)
         return d
 
 
     def test_getOptions(self):
-        def cb(form):
-            self.assertEqual('form', form.formType)
-            self.assertEqual(NS_PUBSUB_SUBSCRIBE_OPTIONS, form.formNamespace)
-            field = form.fields['pubsub#deliver']
-            self.assertEqual('boolean', field.fieldType)
-            self.assertIdentical(True, field.value)
-            self.assertEqual('Enable delivery?', field.label)
-
-        d = self.protocol.getOptions(JID('pubsub.example.org'), 'test',
-                                     JID('user@example.org'),
-                                     sender=JID('user@example.org'))
-        d.addCallback(cb)
+        d = self.protocol.getOptions(_PUBSUB_JID, 'test', _USER_JID,
+                                     sender=_USER_JID)
 
-        iq = self.stub.output[-1]
-        self.assertEqual('pubsub.example.org', iq.getAttribute('to'))
-        self.assertEqual('get', iq.getAttribute('type'))
-        self.assertEqual('pubsub', iq.pubsub.name)
-        self.assertEqual(NS_PUBSUB, iq.pubsub.uri)
-        children = list(domish.generateElementsQNamed(iq.pubsub.children,
-                                                      'options', NS_PUBSUB))
-        self.assertEqual(1, len(children))
-        child = children[0]
-        self.assertEqual('test', child['node'])
+        iq, child = self._expectIq('pubsub.example.org', 'get', NS_PUBSUB,
+                                   'options', node='test')
 
         self.assertEqual(0, len(child.children))
 
-        # Send response
-        form = data_form.Form('form', formNamespace=NS_PUBSUB_SUBSCRIBE_OPTIONS)
-        form.addField(data_form.Field('boolean', var='pubsub#deliver',
-                                                 label='Enable delivery?',
-                                                 value=True))
-        response = toResponse(iq, 'result')
-        response.addElement((NS_PUBSUB, 'pubsub'))
-        response.pubsub.addElement('options')
-        response.pubsub.options.addChild(form.toElement())
-        self.stub.send(response)
+        self._respondOptions(iq)
 
-        return d
+        form = self.successResultOf(d)
+        self.assertEqual('form', form.formType)
+        self.assertEqual(NS_PUBSUB_SUBSCRIBE_OPTIONS, form.formNamespace)
+        field = form.fields['pubsub#deliver']
+        self.assertEqual('boolean', field.fieldType)
+        self.assertIdentical(True, field.value)
+        self.assertEqual('Enable delivery?', field.label)
 
 
     def test_getOptionsWithSubscriptionIdentifier(self):
@@ -952,27 +1029,17 @@ class PubSubClientTest(unittest.TestCase):
         Getting options with a subid should have the subid in the request.
         """
 
-        d = self.protocol.getOptions(JID('pubsub.example.org'), 'test',
-                                     JID('user@example.org'),
-                                     sender=JID('user@example.org'),
+        d = self.protocol.getOptions(_PUBSUB_JID, 'test', _USER_JID,
+                                     sender=_USER_JID,
                                      subscriptionIdentifier='1234')
 
         iq = self.stub.output[-1]
         child = iq.pubsub.options
         self.assertEqual('1234', child['subid'])
 
-        # Send response
-        form = data_form.Form('form', formNamespace=NS_PUBSUB_SUBSCRIBE_OPTIONS)
-        form.addField(data_form.Field('boolean', var='pubsub#deliver',
-                                                 label='Enable delivery?',
-                                                 value=True))
-        response = toResponse(iq, 'result')
-        response.addElement((NS_PUBSUB, 'pubsub'))
-        response.pubsub.addElement('options')
-        response.pubsub.options.addChild(form.toElement())
-        self.stub.send(response)
+        self._respondOptions(iq)
 
-        return d
+        self.successResultOf(d)
 
 
     def test_setOptions(self):
@@ -981,31 +1048,21 @@ class PubSubClientTest(unittest.TestCase):
         """
         options = {'pubsub#deliver': False}
 
-        d = self.protocol.setOptions(JID('pubsub.example.org'), 'test',
-                                     JID('user@example.org'),
+        d = self.protocol.setOptions(_PUBSUB_JID, 'test', _USER_JID,
                                      options,
-                                     sender=JID('user@example.org'))
+                                     sender=_USER_JID)
 
-        iq = self.stub.output[-1]
-        self.assertEqual('pubsub.example.org', iq.getAttribute('to'))
-        self.assertEqual('set', iq.getAttribute('type'))
-        self.assertEqual('pubsub', iq.pubsub.name)
-        self.assertEqual(NS_PUBSUB, iq.pubsub.uri)
-        children = list(domish.generateElementsQNamed(iq.pubsub.children,
-                                                      'options', NS_PUBSUB))
-        self.assertEqual(1, len(children))
-        child = children[0]
-        self.assertEqual('test', child['node'])
+        iq, child = self._expectIq('pubsub.example.org', 'set', NS_PUBSUB,
+                                   'options', node='test')
 
-        form = data_form.findForm(child, NS_PUBSUB_SUBSCRIBE_OPTIONS)
-        self.assertEqual('submit', form.formType)
-        form.typeCheck({'pubsub#deliver': {'type': 'boolean'}})
-        self.assertEqual(options, form.getValues())
+        self.assertEqual('submit', child.x['type'])
+        self.assertEqual({'FORM_TYPE': NS_PUBSUB_SUBSCRIBE_OPTIONS,
+                          'pubsub#deliver': 'false'},
+                         _formValues(child.x))
 
-        response = toResponse(iq, 'result')
-        self.stub.send(response)
+        self._respond(iq)
 
-        return d
+        self.successResultOf(d)
 
 
     def test_setOptionsWithSubscriptionIdentifier(self):
@@ -1014,25 +1071,164 @@ class PubSubClientTest(unittest.TestCase):
         """
         options = {'pubsub#deliver': False}
 
-        d = self.protocol.setOptions(JID('pubsub.example.org'), 'test',
-                                     JID('user@example.org'),
+        d = self.protocol.setOptions(_PUBSUB_JID, 'test', _USER_JID,
                                      options,
                                      subscriptionIdentifier='1234',
-                                     sender=JID('user@example.org'))
+                                     sender=_USER_JID)
 
         iq = self.stub.output[-1]
         child = iq.pubsub.options
         self.assertEqual('1234', child['subid'])
 
-        form = data_form.findForm(child, NS_PUBSUB_SUBSCRIBE_OPTIONS)
-        self.assertEqual('submit', form.formType)
-        form.typeCheck({'pubsub#deliver': {'type': 'boolean'}})
-        self.assertEqual(options, form.getValues())
+        self.assertEqual('submit', child.x['type'])
+        self.assertEqual({'FORM_TYPE': NS_PUBSUB_SUBSCRIBE_OPTIONS,
+                          'pubsub#deliver': 'false'},
+                         _formValues(child.x))
+
+        self._respond(iq)
+
+        self.successResultOf(d)
+
+
+# Requests and the parameters they are parsed into. Each entry holds the
+# suffix of the test name, its docstring, the iq type, the name of the verb
+# element, the namespace of the pubsub element, the attributes of the verb
+# element and the expected values of request attributes. Each entry becomes a
+# test_fromElement<suffix> method on PubSubRequestTest.
+_REQUEST_CASES = [
+    ('Publish', "Test parsing a publish request.",
+     'set', 'publish', NS_PUBSUB, {'node': 'test'},
+     {'verb': 'publish',
+      'nodeIdentifier': 'test',
+      'items': []}),
+    ('Subscribe', "Test parsing a subscription request.",
+     'set', 'subscribe', NS_PUBSUB,
+     {'node': 'test', 'jid': 'user@example.org/Home'},
+     {'verb': 'subscribe',
+      'nodeIdentifier': 'test',
+      'subscriber': _HOME_JID}),
+    ('Unsubscribe', "Test parsing an unsubscription request.",
+     'set', 'unsubscribe', NS_PUBSUB,
+     {'node': 'test', 'jid': 'user@example.org/Home'},
+     {'verb': 'unsubscribe',
+      'nodeIdentifier': 'test',
+      'subscriber': _HOME_JID}),
+    ('OptionsGet', "Test parsing a request for getting subscription options.",
+     'get', 'options', NS_PUBSUB,
+     {'node': 'test', 'jid': 'user@example.org/Home'},
+     {'verb': 'optionsGet',
+      'nodeIdentifier': 'test',
+      'subscriber': _HOME_JID}),
+    ('Subscriptions', "Test parsing a request for all subscriptions.",
+     'get', 'subscriptions', NS_PUBSUB, {},
+     {'verb': 'subscriptions'}),
+    ('Affiliations', "Test parsing a request for all affiliations.",
+     'get', 'affiliations', NS_PUBSUB, {},
+     {'verb': 'affiliations'}),
+    ('Create', "Test parsing a request to create a node.",
+     'set', 'create', NS_PUBSUB, {'node': 'mynode'},
+     {'verb': 'create',
+      'nodeIdentifier': 'mynode',
+      'options': None}),
+    ('Default', "Parsing a default node configuration request without a form "
+                "sets the node type to leaf.",
+     'get', 'default', NS_PUBSUB_OWNER, {},
+     {'verb': 'default',
+      'nodeType': 'leaf'}),
+    ('ConfigureGet', "Test parsing a node configuration get request.",
+     'get', 'configure', NS_PUBSUB_OWNER, {'node': 'test'},
+     {'verb': 'configureGet',
+      'nodeIdentifier': 'test'}),
+    ('Items', "Test parsing an items request.",
+     'get', 'items', NS_PUBSUB, {'node': 'test'},
+     {'verb': 'items',
+      'nodeIdentifier': 'test',
+      'maxItems': None,
+      'subscriptionIdentifier': None,
+      'itemIdentifiers': []}),
+    ('Purge', "Test parsing a purge request.",
+     'set', 'purge', NS_PUBSUB_OWNER, {'node': 'test'},
+     {'verb': 'purge',
+      'nodeIdentifier': 'test'}),
+    ('Delete', "Test parsing a delete request.",
+     'set', 'delete', NS_PUBSUB_OWNER, {'node': 'test'},
+     {'verb': 'delete',
+      'nodeIdentifier': 'test'}),
+]
+
+# Requests that are missing required parameters. Like L{_REQUEST_CASES}, but
+# with the expected publish-subscribe error condition, if any.
+_BAD_REQUEST_CASES = [
+    ('PublishNoNode',
+     "A publish request to the root node should raise an exception.",
+     'set', 'publish', NS_PUBSUB, {},
+     'nodeid-required'),
+    ('SubscribeNoJID',
+     "Subscribe requests without a JID should raise a bad-request exception.",
+     'set', 'subscribe', NS_PUBSUB, {'node': 'test'},
+     'jid-required'),
+    ('UnsubscribeNoJID',
+     "Unsubscribe requests without a JID should raise a bad-request "
+     "exception.",
+     'set', 'unsubscribe', NS_PUBSUB, {'node': 'test'},
+     'jid-required'),
+    ('OptionsSetNoForm',
+     "On a options set request a form is required.",
+     'set', 'options', NS_PUBSUB,
+     {'node': 'test', 'jid': 'user@example.org/Home'},
+     None),
+    ('ConfigureSetNoForm',
+     "On a node configuration set request a form is required.",
+     'set', 'configure', NS_PUBSUB_OWNER, {'node': 'test'},
+     None),
+]
+
+
+
+def _requestTest(doc, stanzaType, childName, namespace, attributes,
+                 expected):
+    """
+    Make a test that a request is parsed into its verb and parameters.
 
-        response = toResponse(iq, 'result')
-        self.stub.send(response)
+    The arguments are those of an entry in L{_REQUEST_CASES}, without the
+    test name suffix. Every request is sent by C{user@example.org} to
+    C{pubsub.example.org}.
+    """
+    def test(self):
+        iq = _makeIQ(stanzaType, childName, namespace, **attributes)
+        request = pubsub.PubSubRequest.fromElement(iq)
+        self.assertEqual(_USER_JID, request.sender)
+        self.assertEqual(_PUBSUB_JID, request.recipient)
+        self.assertEqual(expected,
+                         dict((name, getattr(request, name))
+                              for name in expected))
+
+    test.__doc__ = doc
+    return test
+
+
+def _badRequestTest(doc, stanzaType, childName, namespace, attributes,
+                    pubsubCondition):
+    """
+    Make a test that a request missing parameters raises a bad-request error.
+
+    The arguments are those of an entry in L{_BAD_REQUEST_CASES}, without the
+    test name suffix.
+    """
+    def test(self):
+        iq = _makeIQ(stanzaType, childName, namespace, **attributes)
+        err = self.assertRaises(error.StanzaError,
+                                pubsub.PubSubRequest.fromElement, iq)
+        self.assertEqual('bad-request', err.condition)
+        if pubsubCondition is None:
+            self.assertIsNone(err.appCondition)
+        else:
+            self.assertEqual(NS_PUBSUB_ERRORS, err.appCondition.uri)
+            self.assertEqual(pubsubCondition, err.appCondition.name)
+
+    test.__doc__ = doc
+    return test
 
-        return d
 
 
 class PubSubRequestTest(unittest.TestCase):
@@ -1041,18 +1237,9 @@ class PubSubRequestTest(unittest.TestCase):
         """
         An unknown verb raises NotImplementedError.
         """
-
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <non-existing-verb/>
-          </pubsub>
-        </iq>
-        """
-
+        iq = _makeIQ('set', 'non-existing-verb')
         self.assertRaises(NotImplementedError,
-                          pubsub.PubSubRequest.fromElement, parseXml(xml))
+                          pubsub.PubSubRequest.fromElement, iq)
 
 
     def test_fromElementKnownBadCombination(self):
@@ -1060,57 +1247,26 @@ class PubSubRequestTest(unittest.TestCase):
         Multiple verbs in an unknown configuration raises NotImplementedError.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
+        xml = _iq("""
              <publish/>
              <create/>
-          </pubsub>
-        </iq>
-        """
+        """)
 
         self.assertRaises(NotImplementedError,
                           pubsub.PubSubRequest.fromElement, parseXml(xml))
 
-    def test_fromElementPublish(self):
-        """
-        Test parsing a publish request.
-        """
-
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <publish node='test'/>
-          </pubsub>
-        </iq>
-        """
-
-        request = pubsub.PubSubRequest.fromElement(parseXml(xml))
-        self.assertEqual('publish', request.verb)
-        self.assertEqual(JID('user@example.org'), request.sender)
-        self.assertEqual(JID('pubsub.example.org'), request.recipient)
-        self.assertEqual('test', request.nodeIdentifier)
-        self.assertEqual([], request.items)
-
 
     def test_fromElementPublishItems(self):
         """
         Test parsing a publish request with items.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
+        xml = _iq("""
             <publish node='test'>
               <item id="item1"/>
               <item id="item2"/>
             </publish>
-          </pubsub>
-        </iq>
-        """
+        """)
 
         request = pubsub.PubSubRequest.fromElement(parseXml(xml))
         self.assertEqual(2, len(request.items))
@@ -1126,114 +1282,37 @@ class PubSubRequestTest(unittest.TestCase):
         shouldn't affect processing of the publish request itself.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
+        xml = _iq("""
             <publish node='test'>
               <item id="item1"/>
               <item id="item2"/>
             </publish>
             <publish-options/>
-          </pubsub>
-        </iq>
-        """
+        """)
 
         request = pubsub.PubSubRequest.fromElement(parseXml(xml))
         self.assertEqual(2, len(request.items))
         self.assertEqual(u'item1', request.items[0]["id"])
         self.assertEqual(u'item2', request.items[1]["id"])
 
-    def test_fromElementPublishNoNode(self):
-        """
-        A publish request to the root node should raise an exception.
+
+    def test_fromElementSubscribeEmptyNode(self):
         """
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <publish/>
-          </pubsub>
-        </iq>
+        Test parsing a subscription request to the root node.
         """
 
-        err = self.assertRaises(error.StanzaError,
-                                pubsub.PubSubRequest.fromElement,
-                                parseXml(xml))
-        self.assertEqual('bad-request', err.condition)
-        self.assertEqual(NS_PUBSUB_ERRORS, err.appCondition.uri)
-        self.assertEqual('nodeid-required', err.appCondition.name)
-
-
-    def test_fromElementSubscribe(self):
-        """
-        Test parsing a subscription request.
-        """
-
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <subscribe node='test' jid='user@example.org/Home'/>
-          </pubsub>
-        </iq>
-        """
-
-        request = pubsub.PubSubRequest.fromElement(parseXml(xml))
-        self.assertEqual('subscribe', request.verb)
-        self.assertEqual(JID('user@example.org'), request.sender)
-        self.assertEqual(JID('pubsub.example.org'), request.recipient)
-        self.assertEqual('test', request.nodeIdentifier)
-        self.assertEqual(JID('user@example.org/Home'), request.subscriber)
-
+        iq = _makeIQ('set', 'subscribe', jid='user@example.org/Home')
 
-    def test_fromElementSubscribeEmptyNode(self):
-        """
-        Test parsing a subscription request to the root node.
-        """
-
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <subscribe jid='user@example.org/Home'/>
-          </pubsub>
-        </iq>
-        """
-
-        request = pubsub.PubSubRequest.fromElement(parseXml(xml))
+        request = pubsub.PubSubRequest.fromElement(iq)
         self.assertEqual('', request.nodeIdentifier)
 
 
-    def test_fromElementSubscribeNoJID(self):
-        """
-        Subscribe requests without a JID should raise a bad-request exception.
-        """
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <subscribe node='test'/>
-          </pubsub>
-        </iq>
-        """
-        err = self.assertRaises(error.StanzaError,
-                                pubsub.PubSubRequest.fromElement,
-                                parseXml(xml))
-        self.assertEqual('bad-request', err.condition)
-        self.assertEqual(NS_PUBSUB_ERRORS, err.appCondition.uri)
-        self.assertEqual('jid-required', err.appCondition.name)
-
-
     def test_fromElementSubscribeWithOptions(self):
         """
         Test parsing a subscription request.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
+        xml = _iq("""
             <subscribe node='test' jid='user@example.org/Home'/>
             <options>
               <x xmlns="jabber:x:data" type='submit'>
@@ -1246,9 +1325,7 @@ class PubSubRequestTest(unittest.TestCase):
                 </field>
               </x>
             </options>
-          </pubsub>
-        </iq>
-        """
+        """)
 
         request = pubsub.PubSubRequest.fromElement(parseXml(xml))
         self.assertEqual('subscribe', request.verb)
@@ -1261,10 +1338,7 @@ class PubSubRequestTest(unittest.TestCase):
         The options form should have the right type.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
+        xml = _iq("""
             <subscribe node='test' jid='user@example.org/Home'/>
             <options>
               <x xmlns="jabber:x:data" type='result'>
@@ -1277,9 +1351,7 @@ class PubSubRequestTest(unittest.TestCase):
                 </field>
               </x>
             </options>
-          </pubsub>
-        </iq>
-        """
+        """)
 
         err = self.assertRaises(error.StanzaError,
                                 pubsub.PubSubRequest.fromElement,
@@ -1294,120 +1366,37 @@ class PubSubRequestTest(unittest.TestCase):
         When no (suitable) form is found, the options are empty.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
+        xml = _iq("""
             <subscribe node='test' jid='user@example.org/Home'/>
             <options/>
-          </pubsub>
-        </iq>
-        """
+        """)
 
         request = pubsub.PubSubRequest.fromElement(parseXml(xml))
         self.assertEqual('subscribe', request.verb)
         self.assertEqual({}, request.options.getValues())
 
 
-    def test_fromElementUnsubscribe(self):
-        """
-        Test parsing an unsubscription request.
-        """
-
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <unsubscribe node='test' jid='user@example.org/Home'/>
-          </pubsub>
-        </iq>
-        """
-
-        request = pubsub.PubSubRequest.fromElement(parseXml(xml))
-        self.assertEqual('unsubscribe', request.verb)
-        self.assertEqual(JID('user@example.org'), request.sender)
-        self.assertEqual(JID('pubsub.example.org'), request.recipient)
-        self.assertEqual('test', request.nodeIdentifier)
-        self.assertEqual(JID('user@example.org/Home'), request.subscriber)
-
-
     def test_fromElementUnsubscribeWithSubscriptionIdentifier(self):
         """
         Test parsing an unsubscription request with subscription identifier.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <unsubscribe node='test' jid='user@example.org/Home'
-                         subid='1234'/>
-          </pubsub>
-        </iq>
-        """
+        iq = _makeIQ('set', 'unsubscribe', node='test',
+                     jid='user@example.org/Home', subid='1234')
 
-        request = pubsub.PubSubRequest.fromElement(parseXml(xml))
+        request = pubsub.PubSubRequest.fromElement(iq)
         self.assertEqual('1234', request.subscriptionIdentifier)
 
 
-    def test_fromElementUnsubscribeNoJID(self):
-        """
-        Unsubscribe requests without a JID should raise a bad-request exception.
-        """
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <unsubscribe node='test'/>
-          </pubsub>
-        </iq>
-        """
-        err = self.assertRaises(error.StanzaError,
-                                pubsub.PubSubRequest.fromElement,
-                                parseXml(xml))
-        self.assertEqual('bad-request', err.condition)
-        self.assertEqual(NS_PUBSUB_ERRORS, err.appCondition.uri)
-        self.assertEqual('jid-required', err.appCondition.name)
-
-
-    def test_fromElementOptionsGet(self):
-        """
-        Test parsing a request for getting subscription options.
-        """
-
-        xml = """
-        <iq type='get' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <options node='test' jid='user@example.org/Home'/>
-          </pubsub>
-        </iq>
-        """
-
-        request = pubsub.PubSubRequest.fromElement(parseXml(xml))
-        self.assertEqual('optionsGet', request.verb)
-        self.assertEqual(JID('user@example.org'), request.sender)
-        self.assertEqual(JID('pubsub.example.org'), request.recipient)
-        self.assertEqual('test', request.nodeIdentifier)
-        self.assertEqual(JID('user@example.org/Home'), request.subscriber)
-
-
     def test_fromElementOptionsGetWithSubscriptionIdentifier(self):
         """
         Test parsing a request for getting subscription options with subid.
         """
 
-        xml = """
-        <iq type='get' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <options node='test' jid='user@example.org/Home'
-                     subid='1234'/>
-          </pubsub>
-        </iq>
-        """
+        iq = _makeIQ('get', 'options', node='test',
+                     jid='user@example.org/Home', subid='1234')
 
-        request = pubsub.PubSubRequest.fromElement(parseXml(xml))
+        request = pubsub.PubSubRequest.fromElement(iq)
         self.assertEqual('1234', request.subscriptionIdentifier)
 
 
@@ -1416,28 +1405,15 @@ class PubSubRequestTest(unittest.TestCase):
         Test parsing a request for setting subscription options.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <options node='test' jid='user@example.org/Home'>
-              <x xmlns='jabber:x:data' type='submit'>
-                <field var='FORM_TYPE' type='hidden'>
-                  <value>http://jabber.org/protocol/pubsub#subscribe_options</value>
-                </field>
-                <field var='pubsub#deliver'><value>1</value></field>
-              </x>
-            </options>
-          </pubsub>
-        </iq>
-        """
+        iq = _makeIQ('set', 'options', form=_deliverForm(), node='test',
+                     jid='user@example.org/Home')
 
-        request = pubsub.PubSubRequest.fromElement(parseXml(xml))
+        request = pubsub.PubSubRequest.fromElement(iq)
         self.assertEqual('optionsSet', request.verb)
-        self.assertEqual(JID('user@example.org'), request.sender)
-        self.assertEqual(JID('pubsub.example.org'), request.recipient)
+        self.assertEqual(_USER_JID, request.sender)
+        self.assertEqual(_PUBSUB_JID, request.recipient)
         self.assertEqual('test', request.nodeIdentifier)
-        self.assertEqual(JID('user@example.org/Home'), request.subscriber)
+        self.assertEqual(_HOME_JID, request.subscriber)
         self.assertEqual({'pubsub#deliver': '1'}, request.options.getValues())
 
 
@@ -1446,24 +1422,10 @@ class PubSubRequestTest(unittest.TestCase):
         Test parsing a request for setting subscription options with subid.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <options node='test' jid='user@example.org/Home'
-                     subid='1234'>
-              <x xmlns='jabber:x:data' type='submit'>
-                <field var='FORM_TYPE' type='hidden'>
-                  <value>http://jabber.org/protocol/pubsub#subscribe_options</value>
-                </field>
-                <field var='pubsub#deliver'><value>1</value></field>
-              </x>
-            </options>
-          </pubsub>
-        </iq>
-        """
+        iq = _makeIQ('set', 'options', form=_deliverForm(), node='test',
+                     jid='user@example.org/Home', subid='1234')
 
-        request = pubsub.PubSubRequest.fromElement(parseXml(xml))
+        request = pubsub.PubSubRequest.fromElement(iq)
         self.assertEqual('1234', request.subscriptionIdentifier)
 
 
@@ -1472,16 +1434,11 @@ class PubSubRequestTest(unittest.TestCase):
         Test parsing a request for cancelling setting subscription options.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
+        xml = _iq("""
             <options node='test' jid='user@example.org/Home'>
               <x xmlns='jabber:x:data' type='cancel'/>
             </options>
-          </pubsub>
-        </iq>
-        """
+        """)
 
         request = pubsub.PubSubRequest.fromElement(parseXml(xml))
         self.assertEqual('cancel', request.options.formType)
@@ -1492,10 +1449,7 @@ class PubSubRequestTest(unittest.TestCase):
         On a options set request unknown fields should be ignored.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
+        xml = _iq("""
             <options node='test' jid='user@example.org/Home'>
               <x xmlns='jabber:x:data' type='result'>
                 <field var='FORM_TYPE' type='hidden'>
@@ -1504,9 +1458,7 @@ class PubSubRequestTest(unittest.TestCase):
                 <field var='pubsub#deliver'><value>1</value></field>
               </x>
             </options>
-          </pubsub>
-        </iq>
-        """
+        """)
 
         err = self.assertRaises(error.StanzaError,
                                 pubsub.PubSubRequest.fromElement,
@@ -1516,104 +1468,15 @@ class PubSubRequestTest(unittest.TestCase):
         self.assertEqual(None, err.appCondition)
 
 
-    def test_fromElementOptionsSetNoForm(self):
-        """
-        On a options set request a form is required.
-        """
-
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <options node='test' jid='user@example.org/Home'/>
-          </pubsub>
-        </iq>
-        """
-        err = self.assertRaises(error.StanzaError,
-                                pubsub.PubSubRequest.fromElement,
-                                parseXml(xml))
-        self.assertEqual('bad-request', err.condition)
-        self.assertEqual(None, err.appCondition)
-
-
-    def test_fromElementSubscriptions(self):
-        """
-        Test parsing a request for all subscriptions.
-        """
-
-        xml = """
-        <iq type='get' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <subscriptions/>
-          </pubsub>
-        </iq>
-        """
-
-        request = pubsub.PubSubRequest.fromElement(parseXml(xml))
-        self.assertEqual('subscriptions', request.verb)
-        self.assertEqual(JID('user@example.org'), request.sender)
-        self.assertEqual(JID('pubsub.example.org'), request.recipient)
-
-
-    def test_fromElementAffiliations(self):
-        """
-        Test parsing a request for all affiliations.
-        """
-
-        xml = """
-        <iq type='get' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <affiliations/>
-          </pubsub>
-        </iq>
-        """
-
-        request = pubsub.PubSubRequest.fromElement(parseXml(xml))
-        self.assertEqual('affiliations', request.verb)
-        self.assertEqual(JID('user@example.org'), request.sender)
-        self.assertEqual(JID('pubsub.example.org'), request.recipient)
-
-
-    def test_fromElementCreate(self):
-        """
-        Test parsing a request to create a node.
-        """
-
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <create node='mynode'/>
-          </pubsub>
-        </iq>
-        """
-
-        request = pubsub.PubSubRequest.fromElement(parseXml(xml))
-        self.assertEqual('create', request.verb)
-        self.assertEqual(JID('user@example.org'), request.sender)
-        self.assertEqual(JID('pubsub.example.org'), request.recipient)
-        self.assertEqual('mynode', request.nodeIdentifier)
-        self.assertIdentical(None, request.options)
-
-
     def test_fromElementCreateInstant(self):
         """
         Test parsing a request to create an instant node.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <create/>
-          </pubsub>
-        </iq>
-        """
+        iq = _makeIQ('set', 'create')
 
-        request = pubsub.PubSubRequest.fromElement(parseXml(xml))
-        self.assertIdentical(None, request.nodeIdentifier)
+        request = pubsub.PubSubRequest.fromElement(iq)
+        self.assertIsNone(request.nodeIdentifier)
 
 
     def test_fromElementCreateConfigureEmpty(self):
@@ -1621,15 +1484,10 @@ class PubSubRequestTest(unittest.TestCase):
         Test parsing a request to create a node with an empty configuration.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
+        xml = _iq("""
             <create node='mynode'/>
             <configure/>
-          </pubsub>
-        </iq>
-        """
+        """)
 
         request = pubsub.PubSubRequest.fromElement(parseXml(xml))
         self.assertEqual({}, request.options.getValues())
@@ -1644,15 +1502,10 @@ class PubSubRequestTest(unittest.TestCase):
         but we should accept both orders.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
+        xml = _iq("""
             <configure/>
             <create node='mynode'/>
-          </pubsub>
-        </iq>
-        """
+        """)
 
         request = pubsub.PubSubRequest.fromElement(parseXml(xml))
         self.assertEqual({}, request.options.getValues())
@@ -1664,10 +1517,7 @@ class PubSubRequestTest(unittest.TestCase):
         Test parsing a request to create a node.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
+        xml = _iq("""
             <create node='mynode'/>
             <configure>
               <x xmlns='jabber:x:data' type='submit'>
@@ -1678,9 +1528,7 @@ class PubSubRequestTest(unittest.TestCase):
                 <field var='pubsub#persist_items'><value>0</value></field>
               </x>
             </configure>
-          </pubsub>
-        </iq>
-        """
+        """)
 
         request = pubsub.PubSubRequest.fromElement(parseXml(xml))
         values = request.options
@@ -1695,10 +1543,7 @@ class PubSubRequestTest(unittest.TestCase):
         The form of a node creation request should have the right type.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
+        xml = _iq("""
             <create node='mynode'/>
             <configure>
               <x xmlns='jabber:x:data' type='result'>
@@ -1709,9 +1554,7 @@ class PubSubRequestTest(unittest.TestCase):
                 <field var='pubsub#persist_items'><value>0</value></field>
               </x>
             </configure>
-          </pubsub>
-        </iq>
-        """
+        """)
 
         err = self.assertRaises(error.StanzaError,
                                 pubsub.PubSubRequest.fromElement,
@@ -1721,39 +1564,12 @@ class PubSubRequestTest(unittest.TestCase):
         self.assertEqual(None, err.appCondition)
 
 
-    def test_fromElementDefault(self):
-        """
-        Parsing default node configuration request sets required attributes.
-
-        Besides C{verb}, C{sender} and C{recipient}, we expect C{nodeType}
-        to be set. If not passed it receives the default C{u'leaf'}.
-        """
-
-        xml = """
-        <iq type='get' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
-            <default/>
-          </pubsub>
-        </iq>
-        """
-
-        request = pubsub.PubSubRequest.fromElement(parseXml(xml))
-        self.assertEquals(u'default', request.verb)
-        self.assertEquals(JID('user@example.org'), request.sender)
-        self.assertEquals(JID('pubsub.example.org'), request.recipient)
-        self.assertEquals(u'leaf', request.nodeType)
-
-
     def test_fromElementDefaultCollection(self):
         """
         Parsing default request for collection sets nodeType to collection.
         """
 
-        xml = """
-        <iq type='get' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
+        xml = _iq("""
             <default>
               <x xmlns='jabber:x:data' type='submit'>
                 <field var='FORM_TYPE' type='hidden'>
@@ -1764,34 +1580,10 @@ class PubSubRequestTest(unittest.TestCase):
                 </field>
               </x>
             </default>
-
-          </pubsub>
-        </iq>
-        """
-
-        request = pubsub.PubSubRequest.fromElement(parseXml(xml))
-        self.assertEquals('collection', request.nodeType)
-
-
-    def test_fromElementConfigureGet(self):
-        """
-        Test parsing a node configuration get request.
-        """
-
-        xml = """
-        <iq type='get' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
-            <configure node='test'/>
-          </pubsub>
-        </iq>
-        """
+        """, stanzaType='get', namespace=NS_PUBSUB_OWNER)
 
         request = pubsub.PubSubRequest.fromElement(parseXml(xml))
-        self.assertEqual('configureGet', request.verb)
-        self.assertEqual(JID('user@example.org'), request.sender)
-        self.assertEqual(JID('pubsub.example.org'), request.recipient)
-        self.assertEqual('test', request.nodeIdentifier)
+        self.assertEqual('collection', request.nodeType)
 
 
     def test_fromElementConfigureSet(self):
@@ -1799,10 +1591,7 @@ class PubSubRequestTest(unittest.TestCase):
         On a node configuration set request the Data Form is parsed.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
+        xml = _iq("""
             <configure node='test'>
               <x xmlns='jabber:x:data' type='submit'>
                 <field var='FORM_TYPE' type='hidden'>
@@ -1812,14 +1601,12 @@ class PubSubRequestTest(unittest.TestCase):
                 <field var='pubsub#persist_items'><value>1</value></field>
               </x>
             </configure>
-          </pubsub>
-        </iq>
-        """
+        """, namespace=NS_PUBSUB_OWNER)
 
         request = pubsub.PubSubRequest.fromElement(parseXml(xml))
         self.assertEqual('configureSet', request.verb)
-        self.assertEqual(JID('user@example.org'), request.sender)
-        self.assertEqual(JID('pubsub.example.org'), request.recipient)
+        self.assertEqual(_USER_JID, request.sender)
+        self.assertEqual(_PUBSUB_JID, request.recipient)
         self.assertEqual('test', request.nodeIdentifier)
         self.assertEqual({'pubsub#deliver_payloads': '0',
                           'pubsub#persist_items': '1'},
@@ -1831,16 +1618,11 @@ class PubSubRequestTest(unittest.TestCase):
         The node configuration is cancelled, so no options.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
+        xml = _iq("""
             <configure node='test'>
               <x xmlns='jabber:x:data' type='cancel'/>
             </configure>
-          </pubsub>
-        </iq>
-        """
+        """, namespace=NS_PUBSUB_OWNER)
 
         request = pubsub.PubSubRequest.fromElement(parseXml(xml))
         self.assertEqual('cancel', request.options.formType)
@@ -1851,10 +1633,7 @@ class PubSubRequestTest(unittest.TestCase):
         The form of a node configuraton set request should have the right type.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
+        xml = _iq("""
             <configure node='test'>
               <x xmlns='jabber:x:data' type='result'>
                 <field var='FORM_TYPE' type='hidden'>
@@ -1864,9 +1643,7 @@ class PubSubRequestTest(unittest.TestCase):
                 <field var='x-myfield'><value>1</value></field>
               </x>
             </configure>
-          </pubsub>
-        </iq>
-        """
+        """, namespace=NS_PUBSUB_OWNER)
 
         err = self.assertRaises(error.StanzaError,
                                 pubsub.PubSubRequest.fromElement,
@@ -1876,63 +1653,14 @@ class PubSubRequestTest(unittest.TestCase):
         self.assertEqual(None, err.appCondition)
 
 
-    def test_fromElementConfigureSetNoForm(self):
-        """
-        On a node configuration set request a form is required.
-        """
-
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
-            <configure node='test'/>
-          </pubsub>
-        </iq>
-        """
-        err = self.assertRaises(error.StanzaError,
-                                pubsub.PubSubRequest.fromElement,
-                                parseXml(xml))
-        self.assertEqual('bad-request', err.condition)
-        self.assertEqual(None, err.appCondition)
-
-
-    def test_fromElementItems(self):
-        """
-        Test parsing an items request.
-        """
-        xml = """
-        <iq type='get' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <items node='test'/>
-          </pubsub>
-        </iq>
-        """
-
-        request = pubsub.PubSubRequest.fromElement(parseXml(xml))
-        self.assertEqual('items', request.verb)
-        self.assertEqual(JID('user@example.org'), request.sender)
-        self.assertEqual(JID('pubsub.example.org'), request.recipient)
-        self.assertEqual('test', request.nodeIdentifier)
-        self.assertIdentical(None, request.maxItems)
-        self.assertIdentical(None, request.subscriptionIdentifier)
-        self.assertEqual([], request.itemIdentifiers)
-
-
     def test_fromElementItemsSubscriptionIdentifier(self):
         """
         Test parsing an items request with subscription identifier.
         """
-        xml = """
-        <iq type='get' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <items node='test' subid='1234'/>
-          </pubsub>
-        </iq>
-        """
 
-        request = pubsub.PubSubRequest.fromElement(parseXml(xml))
+        iq = _makeIQ('get', 'items', node='test', subid='1234')
+
+        request = pubsub.PubSubRequest.fromElement(iq)
         self.assertEqual('1234', request.subscriptionIdentifier)
 
 
@@ -1941,66 +1669,28 @@ class PubSubRequestTest(unittest.TestCase):
         Test parsing a retract request.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
+        xml = _iq("""
             <retract node='test'>
               <item id='item1'/>
               <item id='item2'/>
             </retract>
-          </pubsub>
-        </iq>
-        """
+        """)
 
         request = pubsub.PubSubRequest.fromElement(parseXml(xml))
         self.assertEqual('retract', request.verb)
-        self.assertEqual(JID('user@example.org'), request.sender)
-        self.assertEqual(JID('pubsub.example.org'), request.recipient)
+        self.assertEqual(_USER_JID, request.sender)
+        self.assertEqual(_PUBSUB_JID, request.recipient)
         self.assertEqual('test', request.nodeIdentifier)
         self.assertEqual(['item1', 'item2'], request.itemIdentifiers)
 
 
-    def test_fromElementPurge(self):
-        """
-        Test parsing a purge request.
-        """
-
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
-            <purge node='test'/>
-          </pubsub>
-        </iq>
-        """
-
-        request = pubsub.PubSubRequest.fromElement(parseXml(xml))
-        self.assertEqual('purge', request.verb)
-        self.assertEqual(JID('user@example.org'), request.sender)
-        self.assertEqual(JID('pubsub.example.org'), request.recipient)
-        self.assertEqual('test', request.nodeIdentifier)
-
-
-    def test_fromElementDelete(self):
-        """
-        Test parsing a delete request.
-        """
-
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
-            <delete node='test'/>
-          </pubsub>
-        </iq>
-        """
-
-        request = pubsub.PubSubRequest.fromElement(parseXml(xml))
-        self.assertEqual('delete', request.verb)
-        self.assertEqual(JID('user@example.org'), request.sender)
-        self.assertEqual(JID('pubsub.example.org'), request.recipient)
-        self.assertEqual('test', request.nodeIdentifier)
+for _case in _REQUEST_CASES:
+    setattr(PubSubRequestTest, 'test_fromElement' + _case[0],
+            _requestTest(*_case[1:]))
+for _case in _BAD_REQUEST_CASES:
+    setattr(PubSubRequestTest, 'test_fromElement' + _case[0],
+            _badRequestTest(*_case[1:]))
+del _case
 
 
 
@@ -2057,14 +1747,12 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         Test getDiscoInfo calls getNodeInfo and returns some minimal info.
         """
         def cb(info):
-            discoInfo = disco.DiscoInfo()
-            for item in info:
-                discoInfo.append(item)
+            discoInfo = _discoInfo(info)
             self.assertIn(('pubsub', 'service'), discoInfo.identities)
             self.assertIn(disco.NS_DISCO_ITEMS, discoInfo.features)
 
         d = self.service.getDiscoInfo(JID('user@example.org/home'),
-                                      JID('pubsub.example.org'), '')
+                                      _PUBSUB_JID, '')
         d.addCallback(cb)
         return d
 
@@ -2074,9 +1762,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         Test getDiscoInfo with node type.
         """
         def cb(info):
-            discoInfo = disco.DiscoInfo()
-            for item in info:
-                discoInfo.append(item)
+            discoInfo = _discoInfo(info)
             self.assertIn(('pubsub', 'collection'), discoInfo.identities)
 
         def getInfo(requestor, target, nodeIdentifier):
@@ -2085,7 +1771,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
 
         self.resource.getInfo = getInfo
         d = self.service.getDiscoInfo(JID('user@example.org/home'),
-                                      JID('pubsub.example.org'), '')
+                                      _PUBSUB_JID, '')
         d.addCallback(cb)
         return d
 
@@ -2095,9 +1781,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         Test getDiscoInfo with returned meta data.
         """
         def cb(info):
-            discoInfo = disco.DiscoInfo()
-            for item in info:
-                discoInfo.append(item)
+            discoInfo = _discoInfo(info)
 
             self.assertIn(('pubsub', 'leaf'), discoInfo.identities)
             self.assertIn(NS_PUBSUB_META_DATA, discoInfo.extensions)
@@ -2112,7 +1796,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
 
         self.resource.getInfo = getInfo
         d = self.service.getDiscoInfo(JID('user@example.org/home'),
-                                      JID('pubsub.example.org'), '')
+                                      _PUBSUB_JID, '')
         d.addCallback(cb)
         return d
 
@@ -2122,15 +1806,13 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         Test getDiscoInfo with the resource features.
         """
         def cb(info):
-            discoInfo = disco.DiscoInfo()
-            for item in info:
-                discoInfo.append(item)
+            discoInfo = _discoInfo(info)
             self.assertIn('http://jabber.org/protocol/pubsub#publish',
                           discoInfo.features)
 
         self.resource.features = ['publish']
         d = self.service.getDiscoInfo(JID('user@example.org/home'),
-                                      JID('pubsub.example.org'), '')
+                                      _PUBSUB_JID, '')
         d.addCallback(cb)
         return d
 
@@ -2140,7 +1822,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         If getInfo returns invalid response, it should be logged, then ignored.
         """
         def cb(info):
-            self.assertEquals([], info)
+            self.assertEqual([], info)
             self.assertEqual(1, len(self.flushLoggedErrors(TypeError)))
 
         def getInfo(requestor, target, nodeIdentifier):
@@ -2148,7 +1830,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
 
         self.resource.getInfo = getInfo
         d = self.service.getDiscoInfo(JID('user@example.org/home'),
-                                      JID('pubsub.example.org'), 'test')
+                                      _PUBSUB_JID, 'test')
         d.addCallback(cb)
         return d
 
@@ -2158,7 +1840,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         If getInfo returns invalid response, it should be logged, then ignored.
         """
         def cb(info):
-            self.assertEquals([], info)
+            self.assertEqual([], info)
             self.assertEqual(1, len(self.flushLoggedErrors(NotImplementedError)))
 
         def getInfo(requestor, target, nodeIdentifier):
@@ -2166,7 +1848,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
 
         self.resource.getInfo = getInfo
         d = self.service.getDiscoInfo(JID('user@example.org/home'),
-                                      JID('pubsub.example.org'), 'test')
+                                      _PUBSUB_JID, 'test')
         d.addCallback(cb)
         return d
 
@@ -2182,16 +1864,15 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
             self.assertEqual(2, len(items))
             item1, item2 = items
 
-            self.assertEqual(JID('pubsub.example.org'), item1.entity)
+            self.assertEqual(_PUBSUB_JID, item1.entity)
             self.assertEqual('node1', item1.nodeIdentifier)
 
-            self.assertEqual(JID('pubsub.example.org'), item2.entity)
+            self.assertEqual(_PUBSUB_JID, item2.entity)
             self.assertEqual('node2', item2.nodeIdentifier)
 
         self.resource.getNodes = getNodes
         d = self.service.getDiscoItems(JID('user@example.org/home'),
-                                       JID('pubsub.example.org'),
-                                       '')
+                                       _PUBSUB_JID, '')
         d.addCallback(cb)
         return d
 
@@ -2209,8 +1890,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         self.service.hideNodes = True
         self.resource.getNodes = getNodes
         d = self.service.getDiscoItems(JID('user@example.org/home'),
-                                       JID('pubsub.example.org'),
-                                       '')
+                                       _PUBSUB_JID, '')
         d.addCallback(cb)
         return d
 
@@ -2227,8 +1907,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
 
         self.resource.getNodes = getNodes
         d = self.service.getDiscoItems(JID('user@example.org/home'),
-                                       JID('pubsub.example.org'),
-                                       'test')
+                                       _PUBSUB_JID, 'test')
         d.addCallback(cb)
         return d
 
@@ -2239,21 +1918,14 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         called.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <publish node='test'/>
-          </pubsub>
-        </iq>
-        """
+        iq = _makeIQ('set', 'publish', node='test')
 
         def publish(request):
             return defer.succeed(None)
 
         self.resource.publish = publish
         verify.verifyObject(iwokkel.IPubSubResource, self.resource)
-        return self.handleRequest(xml)
+        return self.handleRequest(iq)
 
 
     def test_on_subscribe(self):
@@ -2261,14 +1933,8 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         A successful subscription should return the current subscription.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <subscribe node='test' jid='user@example.org/Home'/>
-          </pubsub>
-        </iq>
-        """
+        iq = _makeIQ('set', 'subscribe', node='test',
+                     jid='user@example.org/Home')
 
         def subscribe(request):
             return defer.succeed(pubsub.Subscription(request.nodeIdentifier,
@@ -2286,7 +1952,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
 
         self.resource.subscribe = subscribe
         verify.verifyObject(iwokkel.IPubSubResource, self.resource)
-        d = self.handleRequest(xml)
+        d = self.handleRequest(iq)
         d.addCallback(cb)
         return d
 
@@ -2296,14 +1962,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         A successful subscription on root node should return no node attribute.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <subscribe jid='user@example.org/Home'/>
-          </pubsub>
-        </iq>
-        """
+        iq = _makeIQ('set', 'subscribe', jid='user@example.org/Home')
 
         def subscribe(request):
             return defer.succeed(pubsub.Subscription(request.nodeIdentifier,
@@ -2315,7 +1974,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
 
         self.resource.subscribe = subscribe
         verify.verifyObject(iwokkel.IPubSubResource, self.resource)
-        d = self.handleRequest(xml)
+        d = self.handleRequest(iq)
         d.addCallback(cb)
         return d
 
@@ -2325,14 +1984,8 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         If a subscription returns a subid, this should be available.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <subscribe node='test' jid='user@example.org/Home'/>
-          </pubsub>
-        </iq>
-        """
+        iq = _makeIQ('set', 'subscribe',
+                     node='test', jid='user@example.org/Home')
 
         def subscribe(request):
             subscription = pubsub.Subscription(request.nodeIdentifier,
@@ -2346,7 +1999,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
 
         self.resource.subscribe = subscribe
         verify.verifyObject(iwokkel.IPubSubResource, self.resource)
-        d = self.handleRequest(xml)
+        d = self.handleRequest(iq)
         d.addCallback(cb)
         return d
 
@@ -2356,24 +2009,18 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         A successful unsubscription should return an empty response.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <unsubscribe node='test' jid='user@example.org/Home'/>
-          </pubsub>
-        </iq>
-        """
+        iq = _makeIQ('set', 'unsubscribe', node='test',
+                     jid='user@example.org/Home')
 
         def unsubscribe(request):
             return defer.succeed(None)
 
         def cb(element):
-            self.assertIdentical(None, element)
+            self.assertIsNone(element)
 
         self.resource.unsubscribe = unsubscribe
         verify.verifyObject(iwokkel.IPubSubResource, self.resource)
-        d = self.handleRequest(xml)
+        d = self.handleRequest(iq)
         d.addCallback(cb)
         return d
 
@@ -2383,25 +2030,19 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         A successful unsubscription with subid should return an empty response.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <unsubscribe node='test' jid='user@example.org/Home' subid='1234'/>
-          </pubsub>
-        </iq>
-        """
+        iq = _makeIQ('set', 'unsubscribe',
+                     node='test', jid='user@example.org/Home', subid='1234')
 
         def unsubscribe(request):
             self.assertEqual('1234', request.subscriptionIdentifier)
             return defer.succeed(None)
 
         def cb(element):
-            self.assertIdentical(None, element)
+            self.assertIsNone(element)
 
         self.resource.unsubscribe = unsubscribe
         verify.verifyObject(iwokkel.IPubSubResource, self.resource)
-        d = self.handleRequest(xml)
+        d = self.handleRequest(iq)
         d.addCallback(cb)
         return d
 
@@ -2411,21 +2052,15 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         Getting subscription options is not supported.
         """
 
-        xml = """
-        <iq type='get' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <options node='test' jid='user@example.org/Home'/>
-          </pubsub>
-        </iq>
-        """
+        iq = _makeIQ('get', 'options',
+                     node='test', jid='user@example.org/Home')
 
         def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
+            self.assertEqual('feature-not-implemented', result.condition)
+            self.assertEqual('unsupported', result.appCondition.name)
+            self.assertEqual(NS_PUBSUB_ERRORS, result.appCondition.uri)
 
-        d = self.handleRequest(xml)
+        d = self.handleRequest(iq)
         self.assertFailure(d, error.StanzaError)
         d.addCallback(cb)
         return d
@@ -2436,10 +2071,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         Setting subscription options is not supported.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
+        xml = _iq("""
             <options node='test' jid='user@example.org/Home'>
               <x xmlns='jabber:x:data' type='submit'>
                 <field var='FORM_TYPE' type='hidden'>
@@ -2448,14 +2080,12 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
                 <field var='pubsub#deliver'><value>1</value></field>
               </x>
             </options>
-          </pubsub>
-        </iq>
-        """
+        """)
 
         def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
+            self.assertEqual('feature-not-implemented', result.condition)
+            self.assertEqual('unsupported', result.appCondition.name)
+            self.assertEqual(NS_PUBSUB_ERRORS, result.appCondition.uri)
 
         d = self.handleRequest(xml)
         self.assertFailure(d, error.StanzaError)
@@ -2470,17 +2100,10 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         for the response.
         """
 
-        xml = """
-        <iq type='get' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <subscriptions/>
-          </pubsub>
-        </iq>
-        """
+        iq = _makeIQ('get', 'subscriptions')
 
         def subscriptions(request):
-            subscription = pubsub.Subscription('test', JID('user@example.org'),
+            subscription = pubsub.Subscription('test', _USER_JID,
                                                'subscribed')
             return defer.succeed([subscription])
 
@@ -2488,9 +2111,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
             self.assertEqual('pubsub', element.name)
             self.assertEqual(NS_PUBSUB, element.uri)
             self.assertEqual(NS_PUBSUB, element.subscriptions.uri)
-            children = list(element.subscriptions.elements())
-            self.assertEqual(1, len(children))
-            subscription = children[0]
+            subscription = _single(element.subscriptions.elements())
             self.assertEqual('subscription', subscription.name)
             self.assertEqual(NS_PUBSUB, subscription.uri, NS_PUBSUB)
             self.assertEqual('user@example.org', subscription['jid'])
@@ -2499,7 +2120,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
 
         self.resource.subscriptions = subscriptions
         verify.verifyObject(iwokkel.IPubSubResource, self.resource)
-        d = self.handleRequest(xml)
+        d = self.handleRequest(iq)
         d.addCallback(cb)
         return d
 
@@ -2509,17 +2130,10 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         A subscriptions request response should include subids, if set.
         """
 
-        xml = """
-        <iq type='get' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <subscriptions/>
-          </pubsub>
-        </iq>
-        """
+        iq = _makeIQ('get', 'subscriptions')
 
         def subscriptions(request):
-            subscription = pubsub.Subscription('test', JID('user@example.org'),
+            subscription = pubsub.Subscription('test', _USER_JID,
                                                'subscribed',
                                                subscriptionIdentifier='1234')
             return defer.succeed([subscription])
@@ -2530,7 +2144,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
 
         self.resource.subscriptions = subscriptions
         verify.verifyObject(iwokkel.IPubSubResource, self.resource)
-        d = self.handleRequest(xml)
+        d = self.handleRequest(iq)
         d.addCallback(cb)
         return d
 
@@ -2542,14 +2156,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         for the response.
         """
 
-        xml = """
-        <iq type='get' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <affiliations/>
-          </pubsub>
-        </iq>
-        """
+        iq = _makeIQ('get', 'affiliations')
 
         def affiliations(request):
             affiliation = ('test', 'owner')
@@ -2559,9 +2166,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
             self.assertEqual('pubsub', element.name)
             self.assertEqual(NS_PUBSUB, element.uri)
             self.assertEqual(NS_PUBSUB, element.affiliations.uri)
-            children = list(element.affiliations.elements())
-            self.assertEqual(1, len(children))
-            affiliation = children[0]
+            affiliation = _single(element.affiliations.elements())
             self.assertEqual('affiliation', affiliation.name)
             self.assertEqual(NS_PUBSUB, affiliation.uri)
             self.assertEqual('test', affiliation['node'])
@@ -2569,7 +2174,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
 
         self.resource.affiliations = affiliations
         verify.verifyObject(iwokkel.IPubSubResource, self.resource)
-        d = self.handleRequest(xml)
+        d = self.handleRequest(iq)
         d.addCallback(cb)
         return d
 
@@ -2579,24 +2184,17 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         Replies to create node requests don't return the created node.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <create node='mynode'/>
-          </pubsub>
-        </iq>
-        """
+        iq = _makeIQ('set', 'create', node='mynode')
 
         def create(request):
             return defer.succeed(request.nodeIdentifier)
 
         def cb(element):
-            self.assertIdentical(None, element)
+            self.assertIsNone(element)
 
         self.resource.create = create
         verify.verifyObject(iwokkel.IPubSubResource, self.resource)
-        d = self.handleRequest(xml)
+        d = self.handleRequest(iq)
         d.addCallback(cb)
         return d
 
@@ -2606,14 +2204,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         Replies to create node requests return the created node if changed.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <create node='mynode'/>
-          </pubsub>
-        </iq>
-        """
+        iq = _makeIQ('set', 'create', node='mynode')
 
         def create(request):
             return defer.succeed(u'myrenamednode')
@@ -2627,7 +2218,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
 
         self.resource.create = create
         verify.verifyObject(iwokkel.IPubSubResource, self.resource)
-        d = self.handleRequest(xml)
+        d = self.handleRequest(iq)
         d.addCallback(cb)
         return d
 
@@ -2637,14 +2228,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         Replies to create instant node requests return the created node.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <create/>
-          </pubsub>
-        </iq>
-        """
+        iq = _makeIQ('set', 'create')
 
         def create(request):
             return defer.succeed(u'random')
@@ -2657,7 +2241,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
 
         self.resource.create = create
         verify.verifyObject(iwokkel.IPubSubResource, self.resource)
-        d = self.handleRequest(xml)
+        d = self.handleRequest(iq)
         d.addCallback(cb)
         return d
 
@@ -2668,10 +2252,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         L{PubSubResource.create} is called with the passed options.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
+        xml = _iq("""
             <create node='mynode'/>
             <configure>
               <x xmlns='jabber:x:data' type='submit'>
@@ -2682,19 +2263,10 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
                 <field var='pubsub#persist_items'><value>1</value></field>
               </x>
             </configure>
-          </pubsub>
-        </iq>
-        """
+        """)
 
         def getConfigurationOptions():
-            return {
-                "pubsub#persist_items":
-                    {"type": "boolean",
-                     "label": "Persist items to storage"},
-                "pubsub#deliver_payloads":
-                    {"type": "boolean",
-                     "label": "Deliver payloads with event notifications"}
-                }
+            return copy.deepcopy(_NODE_CONFIG_OPTIONS)
 
         def create(request):
             self.assertEqual({'pubsub#deliver_payloads': False,
@@ -2713,37 +2285,22 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         A default request returns default options filtered by available fields.
         """
 
-        xml = """
-        <iq type='get' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
-            <default/>
-          </pubsub>
-        </iq>
-        """
-        fieldDefs = {
-                "pubsub#persist_items":
-                    {"type": "boolean",
-                     "label": "Persist items to storage"},
-                "pubsub#deliver_payloads":
-                    {"type": "boolean",
-                     "label": "Deliver payloads with event notifications"}
-                }
+        iq = _makeIQ('get', 'default', NS_PUBSUB_OWNER)
 
         def getConfigurationOptions():
-            return fieldDefs
+            return copy.deepcopy(_NODE_CONFIG_OPTIONS)
 
         def default(request):
             return defer.succeed({'pubsub#persist_items': 'false',
                                   'x-myfield': '1'})
 
         def cb(element):
-            self.assertEquals('pubsub', element.name)
-            self.assertEquals(NS_PUBSUB_OWNER, element.uri)
-            self.assertEquals(NS_PUBSUB_OWNER, element.default.uri)
+            self.assertEqual('pubsub', element.name)
+            self.assertEqual(NS_PUBSUB_OWNER, element.uri)
+            self.assertEqual(NS_PUBSUB_OWNER, element.default.uri)
             form = data_form.Form.fromElement(element.default.x)
-            self.assertEquals(NS_PUBSUB_NODE_CONFIG, form.formNamespace)
-            form.typeCheck(fieldDefs)
+            self.assertEqual(NS_PUBSUB_NODE_CONFIG, form.formNamespace)
+            form.typeCheck(copy.deepcopy(_NODE_CONFIG_OPTIONS))
             self.assertIn('pubsub#persist_items', form.fields)
             self.assertFalse(form.fields['pubsub#persist_items'].value)
             self.assertNotIn('x-myfield', form.fields)
@@ -2751,7 +2308,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         self.resource.getConfigurationOptions = getConfigurationOptions
         self.resource.default = default
         verify.verifyObject(iwokkel.IPubSubResource, self.resource)
-        d = self.handleRequest(xml)
+        d = self.handleRequest(iq)
         d.addCallback(cb)
         return d
 
@@ -2763,10 +2320,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         Both C{getConfigurationOptions} and C{default} must not be called.
         """
 
-        xml = """
-        <iq type='get' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
+        xml = _iq("""
             <default>
               <x xmlns='jabber:x:data' type='submit'>
                 <field var='FORM_TYPE' type='hidden'>
@@ -2778,9 +2332,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
               </x>
             </default>
 
-          </pubsub>
-        </iq>
-        """
+        """, stanzaType='get', namespace=NS_PUBSUB_OWNER)
 
         def getConfigurationOptions():
             self.fail("Unexpected call to getConfigurationOptions")
@@ -2789,7 +2341,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
             self.fail("Unexpected call to default")
 
         def cb(result):
-            self.assertEquals('not-acceptable', result.condition)
+            self.assertEqual('not-acceptable', result.condition)
 
         self.resource.getConfigurationOptions = getConfigurationOptions
         self.resource.default = default
@@ -2807,32 +2359,18 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         data form with the configuration.
         """
 
-        xml = """
-        <iq type='get' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
-            <configure node='test'/>
-          </pubsub>
-        </iq>
-        """
+        iq = _makeIQ('get', 'configure', NS_PUBSUB_OWNER, node='test')
 
         def getConfigurationOptions():
-            return {
-                "pubsub#persist_items":
-                    {"type": "boolean",
-                     "label": "Persist items to storage"},
-                "pubsub#deliver_payloads":
-                    {"type": "boolean",
-                     "label": "Deliver payloads with event notifications"},
-                "pubsub#owner":
-                    {"type": "jid-single",
-                     "label": "Owner of the node"}
-                }
+            options = copy.deepcopy(_NODE_CONFIG_OPTIONS)
+            options["pubsub#owner"] = {"type": "jid-single",
+                                       "label": "Owner of the node"}
+            return options
 
         def configureGet(request):
             return defer.succeed({'pubsub#deliver_payloads': '0',
                                   'pubsub#persist_items': '1',
-                                  'pubsub#owner': JID('user@example.org'),
+                                  'pubsub#owner': _USER_JID,
                                   'x-myfield': 'a'})
 
         def cb(element):
@@ -2841,32 +2379,21 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
             self.assertEqual(NS_PUBSUB_OWNER, element.configure.uri)
             form = data_form.Form.fromElement(element.configure.x)
             self.assertEqual(NS_PUBSUB_NODE_CONFIG, form.formNamespace)
-            fields = form.fields
-
-            self.assertIn('pubsub#deliver_payloads', fields)
-            field = fields['pubsub#deliver_payloads']
-            self.assertEqual('boolean', field.fieldType)
-            field.typeCheck()
-            self.assertEqual(False, field.value)
 
-            self.assertIn('pubsub#persist_items', fields)
-            field = fields['pubsub#persist_items']
-            self.assertEqual('boolean', field.fieldType)
-            field.typeCheck()
-            self.assertEqual(True, field.value)
+            values = {}
+            for name, field in iteritems(form.fields):
+                field.typeCheck()
+                values[name] = (field.fieldType, field.value)
 
-            self.assertIn('pubsub#owner', fields)
-            field = fields['pubsub#owner']
-            self.assertEqual('jid-single', field.fieldType)
-            field.typeCheck()
-            self.assertEqual(JID('user@example.org'), field.value)
-
-            self.assertNotIn('x-myfield', fields)
+            self.assertEqual({'pubsub#deliver_payloads': ('boolean', False),
+                              'pubsub#persist_items': ('boolean', True),
+                              'pubsub#owner': ('jid-single', _USER_JID)},
+                             values)
 
         self.resource.getConfigurationOptions = getConfigurationOptions
         self.resource.configureGet = configureGet
         verify.verifyObject(iwokkel.IPubSubResource, self.resource)
-        d = self.handleRequest(xml)
+        d = self.handleRequest(iq)
         d.addCallback(cb)
         return d
 
@@ -2877,10 +2404,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         L{PubSubResource.configureSet} is called with the passed options.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
+        xml = _iq("""
             <configure node='test'>
               <x xmlns='jabber:x:data' type='submit'>
                 <field var='FORM_TYPE' type='hidden'>
@@ -2890,19 +2414,10 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
                 <field var='pubsub#persist_items'><value>1</value></field>
               </x>
             </configure>
-          </pubsub>
-        </iq>
-        """
+        """, namespace=NS_PUBSUB_OWNER)
 
         def getConfigurationOptions():
-            return {
-                "pubsub#persist_items":
-                    {"type": "boolean",
-                     "label": "Persist items to storage"},
-                "pubsub#deliver_payloads":
-                    {"type": "boolean",
-                     "label": "Deliver payloads with event notifications"}
-                }
+            return copy.deepcopy(_NODE_CONFIG_OPTIONS)
 
         def configureSet(request):
             self.assertEqual({'pubsub#deliver_payloads': False,
@@ -2922,10 +2437,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         L{PubSubResource.configureSet} not called.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
+        xml = _iq("""
             <configure node='test'>
               <x xmlns='jabber:x:data' type='cancel'>
                 <field var='FORM_TYPE' type='hidden'>
@@ -2933,9 +2445,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
                 </field>
               </x>
             </configure>
-          </pubsub>
-        </iq>
-        """
+        """, namespace=NS_PUBSUB_OWNER)
 
         def configureSet(request):
             self.fail("Unexpected call to setConfiguration")
@@ -2950,10 +2460,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         On a node configuration set request unknown fields should be ignored.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
+        xml = _iq("""
             <configure node='test'>
               <x xmlns='jabber:x:data' type='submit'>
                 <field var='FORM_TYPE' type='hidden'>
@@ -2963,23 +2470,14 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
                 <field var='x-myfield'><value>1</value></field>
               </x>
             </configure>
-          </pubsub>
-        </iq>
-        """
+        """, namespace=NS_PUBSUB_OWNER)
 
         def getConfigurationOptions():
-            return {
-                "pubsub#persist_items":
-                    {"type": "boolean",
-                     "label": "Persist items to storage"},
-                "pubsub#deliver_payloads":
-                    {"type": "boolean",
-                     "label": "Deliver payloads with event notifications"}
-                }
+            return copy.deepcopy(_NODE_CONFIG_OPTIONS)
 
         def configureSet(request):
-            self.assertEquals(['pubsub#deliver_payloads'],
-                              list(request.options.keys()))
+            self.assertEqual(['pubsub#deliver_payloads'],
+                             list(request.options.keys()))
 
         self.resource.getConfigurationOptions = getConfigurationOptions
         self.resource.configureSet = configureSet
@@ -2992,10 +2490,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         On a node configuration set request unknown fields should be ignored.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
+        xml = _iq("""
             <configure node='test'>
               <x xmlns='jabber:x:data' type='result'>
                 <field var='FORM_TYPE' type='hidden'>
@@ -3005,12 +2500,10 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
                 <field var='x-myfield'><value>1</value></field>
               </x>
             </configure>
-          </pubsub>
-        </iq>
-        """
+        """, namespace=NS_PUBSUB_OWNER)
 
         def cb(result):
-            self.assertEquals('bad-request', result.condition)
+            self.assertEqual('bad-request', result.condition)
             self.assertEqual("Unexpected form type 'result'", result.text)
 
         d = self.handleRequest(xml)
@@ -3023,14 +2516,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         """
         On a items request, return all items for the given node.
         """
-        xml = """
-        <iq type='get' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <items node='test'/>
-          </pubsub>
-        </iq>
-        """
+        iq = _makeIQ('get', 'items', node='test')
 
         def items(request):
             return defer.succeed([pubsub.Item('current')])
@@ -3047,7 +2533,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
 
         self.resource.items = items
         verify.verifyObject(iwokkel.IPubSubResource, self.resource)
-        d = self.handleRequest(xml)
+        d = self.handleRequest(iq)
         d.addCallback(cb)
         return d
 
@@ -3058,17 +2544,12 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         being called.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
+        xml = _iq("""
             <retract node='test'>
               <item id='item1'/>
               <item id='item2'/>
             </retract>
-          </pubsub>
-        </iq>
-        """
+        """)
 
         def retract(request):
             return defer.succeed(None)
@@ -3084,21 +2565,14 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         called.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
-            <purge node='test'/>
-          </pubsub>
-        </iq>
-        """
+        iq = _makeIQ('set', 'purge', NS_PUBSUB_OWNER, node='test')
 
         def purge(request):
             return defer.succeed(None)
 
         self.resource.purge = purge
         verify.verifyObject(iwokkel.IPubSubResource, self.resource)
-        return self.handleRequest(xml)
+        return self.handleRequest(iq)
 
 
     def test_on_delete(self):
@@ -3107,49 +2581,40 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         called.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
-            <delete node='test'/>
-          </pubsub>
-        </iq>
-        """
+        iq = _makeIQ('set', 'delete', NS_PUBSUB_OWNER, node='test')
 
         def delete(request):
             return defer.succeed(None)
 
         self.resource.delete = delete
         verify.verifyObject(iwokkel.IPubSubResource, self.resource)
-        return self.handleRequest(xml)
+        return self.handleRequest(iq)
 
 
     def test_notifyPublish(self):
         """
         Publish notifications are sent to the subscribers.
         """
-        subscriber = JID('user@example.org')
+        subscriber = _USER_JID
         subscriptions = [pubsub.Subscription('test', subscriber, 'subscribed')]
         items = [pubsub.Item('current')]
         notifications = [(subscriber, subscriptions, items)]
-        self.service.notifyPublish(JID('pubsub.example.org'), 'test',
-                                   notifications)
+        self.service.notifyPublish(_PUBSUB_JID, 'test', notifications)
         message = self.stub.output[-1]
 
-        self.assertEquals('message', message.name)
-        self.assertIdentical(None, message.uri)
-        self.assertEquals('user@example.org', message['to'])
-        self.assertEquals('pubsub.example.org', message['from'])
+        self.assertEqual('message', message.name)
+        self.assertIsNone(message.uri)
+        self.assertEqual('user@example.org', message['to'])
+        self.assertEqual('pubsub.example.org', message['from'])
         self.assertTrue(message.event)
-        self.assertEquals(NS_PUBSUB_EVENT, message.event.uri)
+        self.assertEqual(NS_PUBSUB_EVENT, message.event.uri)
         self.assertTrue(message.event.items)
-        self.assertEquals(NS_PUBSUB_EVENT, message.event.items.uri)
+        self.assertEqual(NS_PUBSUB_EVENT, message.event.items.uri)
         self.assertTrue(message.event.items.hasAttribute('node'))
-        self.assertEquals('test', message.event.items['node'])
-        itemElements = list(domish.generateElementsQNamed(
+        self.assertEqual('test', message.event.items['node'])
+        itemElement = _single(domish.generateElementsQNamed(
             message.event.items.children, 'item', NS_PUBSUB_EVENT))
-        self.assertEquals(1, len(itemElements))
-        self.assertEquals('current', itemElements[0].getAttribute('id'))
+        self.assertEqual('current', itemElement.getAttribute('id'))
 
 
     def test_notifyPublishCollection(self):
@@ -3159,16 +2624,15 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         The node the item was published to is on the C{items} element, while
         the subscribed-to node is in the C{'Collections'} SHIM header.
         """
-        subscriber = JID('user@example.org')
+        subscriber = _USER_JID
         subscriptions = [pubsub.Subscription('', subscriber, 'subscribed')]
         items = [pubsub.Item('current')]
         notifications = [(subscriber, subscriptions, items)]
-        self.service.notifyPublish(JID('pubsub.example.org'), 'test',
-                                   notifications)
+        self.service.notifyPublish(_PUBSUB_JID, 'test', notifications)
         message = self.stub.output[-1]
 
         self.assertTrue(message.event.items.hasAttribute('node'))
-        self.assertEquals('test', message.event.items['node'])
+        self.assertEqual('test', message.event.items['node'])
         headers = shim.extractHeaders(message)
         self.assertIn('Collection', headers)
         self.assertIn('', headers['Collection'])
@@ -3178,15 +2642,14 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         """
         Subscribers should be sent a delete notification.
         """
-        subscriptions = [JID('user@example.org')]
-        self.service.notifyDelete(JID('pubsub.example.org'), 'test',
-                                  subscriptions)
+        subscriptions = [_USER_JID]
+        self.service.notifyDelete(_PUBSUB_JID, 'test', subscriptions)
         message = self.stub.output[-1]
 
-        self.assertEquals('message', message.name)
-        self.assertIdentical(None, message.uri)
-        self.assertEquals('user@example.org', message['to'])
-        self.assertEquals('pubsub.example.org', message['from'])
+        self.assertEqual('message', message.name)
+        self.assertIsNone(message.uri)
+        self.assertEqual('user@example.org', message['to'])
+        self.assertEqual('pubsub.example.org', message['from'])
         self.assertTrue(message.event)
         self.assertEqual(NS_PUBSUB_EVENT, message.event.uri)
         self.assertTrue(message.event.delete)
@@ -3200,15 +2663,15 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         Subscribers should be sent a delete notification with redirect.
         """
         redirectURI = 'xmpp:pubsub.example.org?;node=test2'
-        subscriptions = [JID('user@example.org')]
-        self.service.notifyDelete(JID('pubsub.example.org'), 'test',
-                                  subscriptions, redirectURI)
+        subscriptions = [_USER_JID]
+        self.service.notifyDelete(_PUBSUB_JID, 'test', subscriptions,
+                                  redirectURI)
         message = self.stub.output[-1]
 
-        self.assertEquals('message', message.name)
-        self.assertIdentical(None, message.uri)
-        self.assertEquals('user@example.org', message['to'])
-        self.assertEquals('pubsub.example.org', message['from'])
+        self.assertEqual('message', message.name)
+        self.assertIsNone(message.uri)
+        self.assertEqual('user@example.org', message['to'])
+        self.assertEqual('pubsub.example.org', message['from'])
         self.assertTrue(message.event)
         self.assertEqual(NS_PUBSUB_EVENT, message.event.uri)
         self.assertTrue(message.event.delete)
@@ -3226,26 +2689,10 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         Getting subscription options is not supported.
         """
 
-        xml = """
-        <iq type='get' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
-            <subscriptions/>
-          </pubsub>
-        </iq>
-        """
-
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('manage-subscriptions',
-                              result.appCondition['feature'])
+        iq = _makeIQ('get', 'subscriptions', NS_PUBSUB_OWNER)
 
-        d = self.handleRequest(xml)
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
+        _assertUnsupported(self, self.handleRequest(iq),
+                           'manage-subscriptions')
 
 
     def test_on_subscriptionsSet(self):
@@ -3253,26 +2700,10 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         Setting subscription options is not supported.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
-            <subscriptions/>
-          </pubsub>
-        </iq>
-        """
-
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('manage-subscriptions',
-                              result.appCondition['feature'])
+        iq = _makeIQ('set', 'subscriptions', NS_PUBSUB_OWNER)
 
-        d = self.handleRequest(xml)
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
+        _assertUnsupported(self, self.handleRequest(iq),
+                           'manage-subscriptions')
 
 
     def test_on_affiliationsGet(self):
@@ -3280,35 +2711,26 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         Getting node affiliations should have.
         """
 
-        xml = """
-        <iq type='get' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
-            <affiliations node='test'/>
-          </pubsub>
-        </iq>
-        """
+        iq = _makeIQ('get', 'affiliations', NS_PUBSUB_OWNER, node='test')
 
         def affiliationsGet(request):
-            self.assertEquals('test', request.nodeIdentifier)
-            return defer.succeed({JID('user@example.org'): 'owner'})
+            self.assertEqual('test', request.nodeIdentifier)
+            return defer.succeed({_USER_JID: 'owner'})
 
         def cb(element):
-            self.assertEquals(u'pubsub', element.name)
-            self.assertEquals(NS_PUBSUB_OWNER, element.uri)
-            self.assertEquals(NS_PUBSUB_OWNER, element.affiliations.uri)
-            self.assertEquals(u'test', element.affiliations[u'node'])
-            children = list(element.affiliations.elements())
-            self.assertEquals(1, len(children))
-            affiliation = children[0]
-            self.assertEquals(u'affiliation', affiliation.name)
-            self.assertEquals(NS_PUBSUB_OWNER, affiliation.uri)
-            self.assertEquals(u'user@example.org', affiliation[u'jid'])
-            self.assertEquals(u'owner', affiliation[u'affiliation'])
+            self.assertEqual(u'pubsub', element.name)
+            self.assertEqual(NS_PUBSUB_OWNER, element.uri)
+            self.assertEqual(NS_PUBSUB_OWNER, element.affiliations.uri)
+            self.assertEqual(u'test', element.affiliations[u'node'])
+            affiliation = _single(element.affiliations.elements())
+            self.assertEqual(u'affiliation', affiliation.name)
+            self.assertEqual(NS_PUBSUB_OWNER, affiliation.uri)
+            self.assertEqual(u'user@example.org', affiliation[u'jid'])
+            self.assertEqual(u'owner', affiliation[u'affiliation'])
 
         self.resource.affiliationsGet = affiliationsGet
         verify.verifyObject(iwokkel.IPubSubResource, self.resource)
-        d = self.handleRequest(xml)
+        d = self.handleRequest(iq)
         d.addCallback(cb)
         return d
 
@@ -3318,14 +2740,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         Getting node affiliations without node should assume empty node.
         """
 
-        xml = """
-        <iq type='get' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
-            <affiliations/>
-          </pubsub>
-        </iq>
-        """
+        iq = _makeIQ('get', 'affiliations', NS_PUBSUB_OWNER)
 
         def affiliationsGet(request):
             self.assertEqual('', request.nodeIdentifier)
@@ -3336,7 +2751,7 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
 
         self.resource.affiliationsGet = affiliationsGet
         verify.verifyObject(iwokkel.IPubSubResource, self.resource)
-        d = self.handleRequest(xml)
+        d = self.handleRequest(iq)
         d.addCallback(cb)
         return d
 
@@ -3346,22 +2761,17 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         Setting node affiliations has the affiliations to be modified.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
+        xml = _iq("""
             <affiliations node='test'>
               <affiliation jid='other@example.org' affiliation='publisher'/>
             </affiliations>
-          </pubsub>
-        </iq>
-        """
+        """, namespace=NS_PUBSUB_OWNER)
 
         def affiliationsSet(request):
-            self.assertEquals(u'test', request.nodeIdentifier)
+            self.assertEqual(u'test', request.nodeIdentifier)
             otherJID = JID(u'other@example.org')
             self.assertIn(otherJID, request.affiliations)
-            self.assertEquals(u'publisher', request.affiliations[otherJID])
+            self.assertEqual(u'publisher', request.affiliations[otherJID])
 
         self.resource.affiliationsSet = affiliationsSet
         return self.handleRequest(xml)
@@ -3372,17 +2782,12 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         Affiliations are always on the bare JID.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
+        xml = _iq("""
             <affiliations node='test'>
               <affiliation jid='other@example.org/Home'
                            affiliation='publisher'/>
             </affiliations>
-          </pubsub>
-        </iq>
-        """
+        """, namespace=NS_PUBSUB_OWNER)
 
         def affiliationsSet(request):
             otherJID = JID(u'other@example.org')
@@ -3397,20 +2802,15 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         Setting node affiliations can only have one item per entity.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
+        xml = _iq("""
             <affiliations node='test'>
               <affiliation jid='other@example.org' affiliation='publisher'/>
               <affiliation jid='other@example.org' affiliation='owner'/>
             </affiliations>
-          </pubsub>
-        </iq>
-        """
+        """, namespace=NS_PUBSUB_OWNER)
 
         def cb(result):
-            self.assertEquals('bad-request', result.condition)
+            self.assertEqual('bad-request', result.condition)
 
         d = self.handleRequest(xml)
         self.assertFailure(d, error.StanzaError)
@@ -3423,19 +2823,14 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         Setting node affiliations must include a JID per affiliation.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
+        xml = _iq("""
             <affiliations node='test'>
               <affiliation affiliation='publisher'/>
             </affiliations>
-          </pubsub>
-        </iq>
-        """
+        """, namespace=NS_PUBSUB_OWNER)
 
         def cb(result):
-            self.assertEquals('bad-request', result.condition)
+            self.assertEqual('bad-request', result.condition)
 
         d = self.handleRequest(xml)
         self.assertFailure(d, error.StanzaError)
@@ -3448,19 +2843,14 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
         Setting node affiliations must include an affiliation.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
+        xml = _iq("""
             <affiliations node='test'>
               <affiliation jid='other@example.org'/>
             </affiliations>
-          </pubsub>
-        </iq>
-        """
+        """, namespace=NS_PUBSUB_OWNER)
 
         def cb(result):
-            self.assertEquals('bad-request', result.condition)
+            self.assertEqual('bad-request', result.condition)
 
         d = self.handleRequest(xml)
         self.assertFailure(d, error.StanzaError)
@@ -3469,6 +2859,68 @@ class PubSubServiceTest(unittest.TestCase, TestableRequestHandlerMixin):
 
 
 
+# Requests that PubSubService answers with an unsupported error when its
+# handler methods are not overridden. Each entry holds the iq type, the name of
+# the verb element, the namespace of the pubsub element, the attributes of the
+# verb element and the name of the unsupported feature. Each entry becomes a
+# test_unsupported_<verb> method on PubSubServiceWithoutResourceTest. The
+# entries only differ in these values, so the test docstrings are generated
+# from them.
+_UNSUPPORTED_CASES = [
+    ('set', 'publish', NS_PUBSUB, {'node': 'mynode'}, 'publish'),
+    ('set', 'subscribe', NS_PUBSUB,
+     {'jid': 'user@example.org/Home', 'node': 'test'},
+     'subscribe'),
+    ('set', 'unsubscribe', NS_PUBSUB,
+     {'jid': 'user@example.org/Home', 'node': 'test'},
+     'subscribe'),
+    ('get', 'subscriptions', NS_PUBSUB, {}, 'retrieve-subscriptions'),
+    ('get', 'affiliations', NS_PUBSUB, {}, 'retrieve-affiliations'),
+    ('set', 'create', NS_PUBSUB, {'node': 'mynode'}, 'create-nodes'),
+    ('get', 'default', NS_PUBSUB_OWNER, {}, 'retrieve-default'),
+    ('get', 'configure', NS_PUBSUB_OWNER, {}, 'config-node'),
+    ('get', 'items', NS_PUBSUB, {'node': 'test'}, 'retrieve-items'),
+    ('set', 'purge', NS_PUBSUB_OWNER, {'node': 'test'}, 'purge-nodes'),
+    ('set', 'delete', NS_PUBSUB_OWNER, {'node': 'test'}, 'delete-nodes'),
+]
+
+
+
+def _assertUnsupported(testCase, d, feature):
+    """
+    Assert that a deferred has failed with an unsupported feature error.
+
+    @param testCase: The test case to make the assertions with.
+    @type testCase: L{unittest.TestCase}
+    @param d: The deferred that is expected to have failed.
+    @type d: L{defer.Deferred}
+    @param feature: The name of the expected unsupported feature.
+    @type feature: L{str}
+    """
+    err = testCase.failureResultOf(d, error.StanzaError).value
+    testCase.assertEqual(('feature-not-implemented', NS_PUBSUB_ERRORS,
+                          'unsupported', feature),
+                         (err.condition, err.appCondition.uri,
+                          err.appCondition.name, err.appCondition['feature']))
+
+
+def _unsupportedRequestTest(stanzaType, childName, namespace, attributes,
+                            feature):
+    """
+    Make a test that a request yields an unsupported feature error.
+
+    The arguments are those of an entry in L{_UNSUPPORTED_CASES}.
+    """
+    def test(self):
+        iq = _makeIQ(stanzaType, childName, namespace, **attributes)
+        _assertUnsupported(self, self.handleRequest(iq), feature)
+
+    test.__doc__ = ("Non-overridden handling of %s %s requests yields an "
+                    "unsupported %s error." % (stanzaType, childName, feature))
+    return test
+
+
+
 class PubSubServiceWithoutResourceTest(unittest.TestCase, TestableRequestHandlerMixin):
 
     def setUp(self):
@@ -3482,226 +2934,12 @@ class PubSubServiceWithoutResourceTest(unittest.TestCase, TestableRequestHandler
         Test getDiscoInfo calls getNodeInfo and returns some minimal info.
         """
         def cb(info):
-            discoInfo = disco.DiscoInfo()
-            for item in info:
-                discoInfo.append(item)
+            discoInfo = _discoInfo(info)
             self.assertIn(('pubsub', 'service'), discoInfo.identities)
             self.assertIn(disco.NS_DISCO_ITEMS, discoInfo.features)
 
         d = self.service.getDiscoInfo(JID('user@example.org/home'),
-                                      JID('pubsub.example.org'), '')
-        d.addCallback(cb)
-        return d
-
-
-    def test_publish(self):
-        """
-        Non-overridden L{PubSubService.publish} yields unsupported error.
-        """
-
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <publish node='mynode'/>
-          </pubsub>
-        </iq>
-        """
-
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('publish', result.appCondition['feature'])
-
-        d = self.handleRequest(xml)
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
-
-
-    def test_subscribe(self):
-        """
-        Non-overridden L{PubSubService.subscribe} yields unsupported error.
-        """
-
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <subscribe node='test' jid='user@example.org/Home'/>
-          </pubsub>
-        </iq>
-        """
-
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('subscribe', result.appCondition['feature'])
-
-        d = self.handleRequest(xml)
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
-
-
-    def test_unsubscribe(self):
-        """
-        Non-overridden L{PubSubService.unsubscribe} yields unsupported error.
-        """
-
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <unsubscribe node='test' jid='user@example.org/Home'/>
-          </pubsub>
-        </iq>
-        """
-
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('subscribe', result.appCondition['feature'])
-
-        d = self.handleRequest(xml)
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
-
-
-    def test_subscriptions(self):
-        """
-        Non-overridden L{PubSubService.subscriptions} yields unsupported error.
-        """
-
-        xml = """
-        <iq type='get' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <subscriptions/>
-          </pubsub>
-        </iq>
-        """
-
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('retrieve-subscriptions',
-                              result.appCondition['feature'])
-
-        d = self.handleRequest(xml)
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
-
-
-    def test_affiliations(self):
-        """
-        Non-overridden L{PubSubService.affiliations} yields unsupported error.
-        """
-
-        xml = """
-        <iq type='get' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <affiliations/>
-          </pubsub>
-        </iq>
-        """
-
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('retrieve-affiliations',
-                              result.appCondition['feature'])
-
-        d = self.handleRequest(xml)
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
-
-
-    def test_create(self):
-        """
-        Non-overridden L{PubSubService.create} yields unsupported error.
-        """
-
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <create node='mynode'/>
-          </pubsub>
-        </iq>
-        """
-
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('create-nodes', result.appCondition['feature'])
-
-        d = self.handleRequest(xml)
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
-
-
-    def test_getDefaultConfiguration(self):
-        """
-        Non-overridden L{PubSubService.getDefaultConfiguration} yields
-        unsupported error.
-        """
-
-        xml = """
-        <iq type='get' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
-            <default/>
-          </pubsub>
-        </iq>
-        """
-
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('retrieve-default', result.appCondition['feature'])
-
-        d = self.handleRequest(xml)
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
-
-
-    def test_getConfiguration(self):
-        """
-        Non-overridden L{PubSubService.getConfiguration} yields unsupported
-        error.
-        """
-
-        xml = """
-        <iq type='get' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
-            <configure/>
-          </pubsub>
-        </iq>
-        """
-
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('config-node', result.appCondition['feature'])
-
-        d = self.handleRequest(xml)
-        self.assertFailure(d, error.StanzaError)
+                                      _PUBSUB_JID, '')
         d.addCallback(cb)
         return d
 
@@ -3712,10 +2950,7 @@ class PubSubServiceWithoutResourceTest(unittest.TestCase, TestableRequestHandler
         error.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
+        xml = _iq("""
             <configure node='test'>
               <x xmlns='jabber:x:data' type='submit'>
                 <field var='FORM_TYPE' type='hidden'>
@@ -3725,20 +2960,9 @@ class PubSubServiceWithoutResourceTest(unittest.TestCase, TestableRequestHandler
                 <field var='pubsub#persist_items'><value>1</value></field>
               </x>
             </configure>
-          </pubsub>
-        </iq>
-        """
+        """, namespace=NS_PUBSUB_OWNER)
 
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('config-node', result.appCondition['feature'])
-
-        d = self.handleRequest(xml)
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
+        _assertUnsupported(self, self.handleRequest(xml), 'config-node')
 
 
     def test_setConfigurationOptionsDict(self):
@@ -3746,10 +2970,7 @@ class PubSubServiceWithoutResourceTest(unittest.TestCase, TestableRequestHandler
         Options should be passed as a dictionary, not a form.
         """
 
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
+        xml = _iq("""
             <configure node='test'>
               <x xmlns='jabber:x:data' type='submit'>
                 <field var='FORM_TYPE' type='hidden'>
@@ -3759,19 +2980,10 @@ class PubSubServiceWithoutResourceTest(unittest.TestCase, TestableRequestHandler
                 <field var='pubsub#persist_items'><value>1</value></field>
               </x>
             </configure>
-          </pubsub>
-        </iq>
-        """
+        """, namespace=NS_PUBSUB_OWNER)
 
         def getConfigurationOptions():
-            return {
-                "pubsub#persist_items":
-                    {"type": "boolean",
-                     "label": "Persist items to storage"},
-                "pubsub#deliver_payloads":
-                    {"type": "boolean",
-                     "label": "Deliver payloads with event notifications"}
-                }
+            return copy.deepcopy(_NODE_CONFIG_OPTIONS)
 
         def setConfiguration(requestor, service, nodeIdentifier, options):
             self.assertIn('pubsub#deliver_payloads', options)
@@ -3784,131 +2996,81 @@ class PubSubServiceWithoutResourceTest(unittest.TestCase, TestableRequestHandler
         return self.handleRequest(xml)
 
 
-    def test_items(self):
-        """
-        Non-overridden L{PubSubService.items} yields unsupported error.
-        """
-        xml = """
-        <iq type='get' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
-            <items node='test'/>
-          </pubsub>
-        </iq>
-        """
-
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('retrieve-items', result.appCondition['feature'])
-
-        d = self.handleRequest(xml)
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
-
-
     def test_retract(self):
         """
         Non-overridden L{PubSubService.retract} yields unsupported error.
         """
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub'>
+        xml = _iq("""
             <retract node='test'>
               <item id='item1'/>
               <item id='item2'/>
             </retract>
-          </pubsub>
-        </iq>
-        """
+        """)
 
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('retract-items', result.appCondition['feature'])
-
-        d = self.handleRequest(xml)
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
+        _assertUnsupported(self, self.handleRequest(xml), 'retract-items')
 
 
-    def test_purge(self):
-        """
-        Non-overridden L{PubSubService.purge} yields unsupported error.
+    def test_unknown(self):
         """
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
-            <purge node='test'/>
-          </pubsub>
-        </iq>
+        Unknown verb yields unsupported error.
         """
+        iq = _makeIQ('get', 'affiliations', NS_PUBSUB_OWNER, node='test')
 
         def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('purge-nodes', result.appCondition['feature'])
+            self.assertEqual('feature-not-implemented', result.condition)
+            self.assertEqual('unsupported', result.appCondition.name)
+            self.assertEqual(NS_PUBSUB_ERRORS, result.appCondition.uri)
 
-        d = self.handleRequest(xml)
+        d = self.handleRequest(iq)
         self.assertFailure(d, error.StanzaError)
         d.addCallback(cb)
         return d
 
 
-    def test_delete(self):
-        """
-        Non-overridden L{PubSubService.delete} yields unsupported error.
-        """
-        xml = """
-        <iq type='set' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
-            <delete node='test'/>
-          </pubsub>
-        </iq>
-        """
+for _case in _UNSUPPORTED_CASES:
+    setattr(PubSubServiceWithoutResourceTest, 'test_unsupported_' + _case[1],
+            _unsupportedRequestTest(*_case))
+del _case
 
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('delete-nodes', result.appCondition['feature'])
 
-        d = self.handleRequest(xml)
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
 
+# Resource methods that yield an unsupported error when not overridden, with
+# the name of the unsupported feature. Each entry becomes a
+# test_unsupported_<method> method on PubSubResourceTest, with a docstring
+# generated from the entry.
+_UNSUPPORTED_RESOURCE_CASES = [
+    ('publish', 'publish'),
+    ('subscribe', 'subscribe'),
+    ('unsubscribe', 'subscribe'),
+    ('subscriptions', 'retrieve-subscriptions'),
+    ('affiliations', 'retrieve-affiliations'),
+    ('create', 'create-nodes'),
+    ('default', 'retrieve-default'),
+    ('configureGet', 'config-node'),
+    ('configureSet', 'config-node'),
+    ('items', 'retrieve-items'),
+    ('retract', 'retract-items'),
+    ('purge', 'purge-nodes'),
+    ('delete', 'delete-nodes'),
+    ('affiliationsGet', 'modify-affiliations'),
+    ('affiliationsSet', 'modify-affiliations'),
+]
 
-    def test_unknown(self):
-        """
-        Unknown verb yields unsupported error.
-        """
-        xml = """
-        <iq type='get' to='pubsub.example.org'
-                       from='user@example.org'>
-          <pubsub xmlns='http://jabber.org/protocol/pubsub#owner'>
-            <affiliations node='test'/>
-          </pubsub>
-        </iq>
-        """
 
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
 
-        d = self.handleRequest(xml)
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
+def _unsupportedResourceTest(methodName, feature):
+    """
+    Make a test that a resource method yields an unsupported feature error.
+
+    The arguments are those of an entry in L{_UNSUPPORTED_RESOURCE_CASES}.
+    """
+    def test(self):
+        method = getattr(self.resource, methodName)
+        _assertUnsupported(self, method(pubsub.PubSubRequest()), feature)
+
+    test.__doc__ = ("Non-overridden L{PubSubResource.%s} yields an "
+                    "unsupported %s error." % (methodName, feature))
+    return test
 
 
 
@@ -3930,272 +3092,16 @@ class PubSubResourceTest(unittest.TestCase):
         Default getNodes returns an empty list.
         """
         def cb(nodes):
-            self.assertEquals([], nodes)
+            self.assertEqual([], nodes)
 
         d = self.resource.getNodes(JID('user@example.org/home'),
-                                   JID('pubsub.example.org'),
-                                   '')
-        d.addCallback(cb)
-        return d
-
-
-    def test_publish(self):
-        """
-        Non-overridden L{PubSubResource.publish} yields unsupported
-        error.
-        """
-
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('publish', result.appCondition['feature'])
-
-        d = self.resource.publish(pubsub.PubSubRequest())
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
-
-
-    def test_subscribe(self):
-        """
-        Non-overridden subscriptions yields unsupported error.
-        """
-
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('subscribe', result.appCondition['feature'])
-
-        d = self.resource.subscribe(pubsub.PubSubRequest())
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
-
-
-    def test_unsubscribe(self):
-        """
-        Non-overridden unsubscribe yields unsupported error.
-        """
-
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('subscribe', result.appCondition['feature'])
-
-        d = self.resource.unsubscribe(pubsub.PubSubRequest())
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
-
-
-    def test_subscriptions(self):
-        """
-        Non-overridden subscriptions yields unsupported error.
-        """
-
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('retrieve-subscriptions',
-                              result.appCondition['feature'])
-
-        d = self.resource.subscriptions(pubsub.PubSubRequest())
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
-
-
-    def test_affiliations(self):
-        """
-        Non-overridden affiliations yields unsupported error.
-        """
-
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('retrieve-affiliations',
-                              result.appCondition['feature'])
-
-        d = self.resource.affiliations(pubsub.PubSubRequest())
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
-
-
-    def test_create(self):
-        """
-        Non-overridden create yields unsupported error.
-        """
-
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('create-nodes', result.appCondition['feature'])
-
-        d = self.resource.create(pubsub.PubSubRequest())
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
-
-
-    def test_default(self):
-        """
-        Non-overridden default yields unsupported error.
-        """
-
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('retrieve-default',
-                              result.appCondition['feature'])
-
-        d = self.resource.default(pubsub.PubSubRequest())
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
-
-
-    def test_configureGet(self):
-        """
-        Non-overridden configureGet yields unsupported
-        error.
-        """
-
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('config-node', result.appCondition['feature'])
-
-        d = self.resource.configureGet(pubsub.PubSubRequest())
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
-
-
-    def test_configureSet(self):
-        """
-        Non-overridden configureSet yields unsupported error.
-        """
-
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('config-node', result.appCondition['feature'])
-
-        d = self.resource.configureSet(pubsub.PubSubRequest())
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
-
-
-    def test_items(self):
-        """
-        Non-overridden items yields unsupported error.
-        """
-
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('retrieve-items', result.appCondition['feature'])
-
-        d = self.resource.items(pubsub.PubSubRequest())
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
-
-
-    def test_retract(self):
-        """
-        Non-overridden retract yields unsupported error.
-        """
-
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('retract-items', result.appCondition['feature'])
-
-        d = self.resource.retract(pubsub.PubSubRequest())
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
-
-
-    def test_purge(self):
-        """
-        Non-overridden purge yields unsupported error.
-        """
-
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('purge-nodes', result.appCondition['feature'])
-
-        d = self.resource.purge(pubsub.PubSubRequest())
-        self.assertFailure(d, error.StanzaError)
+                                   _PUBSUB_JID, '')
         d.addCallback(cb)
         return d
 
 
-    def test_delete(self):
-        """
-        Non-overridden delete yields unsupported error.
-        """
-
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('delete-nodes', result.appCondition['feature'])
-
-        d = self.resource.delete(pubsub.PubSubRequest())
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
-
-
-    def test_affiliationsGet(self):
-        """
-        Non-overridden owner affiliations get yields unsupported error.
-        """
-
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('modify-affiliations',
-                              result.appCondition['feature'])
 
-        d = self.resource.affiliationsGet(pubsub.PubSubRequest())
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
-
-
-    def test_affiliationsSet(self):
-        """
-        Non-overridden owner affiliations set yields unsupported error.
-        """
-
-        def cb(result):
-            self.assertEquals('feature-not-implemented', result.condition)
-            self.assertEquals('unsupported', result.appCondition.name)
-            self.assertEquals(NS_PUBSUB_ERRORS, result.appCondition.uri)
-            self.assertEquals('modify-affiliations',
-                              result.appCondition['feature'])
-
-        d = self.resource.affiliationsSet(pubsub.PubSubRequest())
-        self.assertFailure(d, error.StanzaError)
-        d.addCallback(cb)
-        return d
+for _case in _UNSUPPORTED_RESOURCE_CASES:
+    setattr(PubSubResourceTest, 'test_unsupported_' + _case[0],
+            _unsupportedResourceTest(*_case))
+del _case
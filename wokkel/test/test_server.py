@@ -47,6 +47,18 @@ class XMPPServerListenAuthenticatorTest(unittest.TestCase):
     sid = "D60000229F"
     key = '37c69b1cf07a3f67c04a5ef5902fa5114f2c76fe4a2686482ba5b89323075643'
 
+    headerVersion0 = (
+        "<stream:stream xmlns:stream='http://etherx.jabber.org/streams' "
+                       "xmlns:db='jabber:server:dialback' "
+                       "xmlns='jabber:server' "
+                       "to='xmpp.example.com'>")
+    headerVersion1 = (
+        "<stream:stream xmlns:stream='http://etherx.jabber.org/streams' "
+                       "xmlns:db='jabber:server:dialback' "
+                       "xmlns='jabber:server' "
+                       "to='xmpp.example.com' "
+                       "version='1.0'>")
+
     def setUp(self):
         self.output = []
 
@@ -77,11 +89,7 @@ class XMPPServerListenAuthenticatorTest(unittest.TestCase):
         The authenticator supports pre-XMPP 1.0 streams.
         """
         self.xmlstream.connectionMade()
-        self.xmlstream.dataReceived(
-            "<stream:stream xmlns:stream='http://etherx.jabber.org/streams' "
-                           "xmlns:db='jabber:server:dialback' "
-                           "xmlns='jabber:server' "
-                           "to='xmpp.example.com'>")
+        self.xmlstream.dataReceived(self.headerVersion0)
         self.assertEqual((0, 0), self.xmlstream.version)
 
 
@@ -90,12 +98,7 @@ class XMPPServerListenAuthenticatorTest(unittest.TestCase):
         The authenticator supports XMPP 1.0 streams.
         """
         self.xmlstream.connectionMade()
-        self.xmlstream.dataReceived(
-            "<stream:stream xmlns:stream='http://etherx.jabber.org/streams' "
-                           "xmlns:db='jabber:server:dialback' "
-                           "xmlns='jabber:server' "
-                           "to='xmpp.example.com' "
-                           "version='1.0'>")
+        self.xmlstream.dataReceived(self.headerVersion1)
         self.assertEqual((1, 0), self.xmlstream.version)
 
 
@@ -106,12 +109,7 @@ class XMPPServerListenAuthenticatorTest(unittest.TestCase):
         self.xmlstream.connectionMade()
         self.assertIdentical(None, self.xmlstream.sid)
 
-        self.xmlstream.dataReceived(
-            "<stream:stream xmlns:stream='http://etherx.jabber.org/streams' "
-                           "xmlns:db='jabber:server:dialback' "
-                           "xmlns='jabber:server' "
-                           "to='xmpp.example.com' "
-                           "version='1.0'>")
+        self.xmlstream.dataReceived(self.headerVersion1)
         self.assertNotIdentical(None, self.xmlstream.sid)
 
 
@@ -122,11 +120,7 @@ class XMPPServerListenAuthenticatorTest(unittest.TestCase):
         self.xmlstream.connectionMade()
         self.assertFalse(self.xmlstream._headerSent)
 
-        self.xmlstream.dataReceived(
-            "<stream:stream xmlns:stream='http://etherx.jabber.org/streams' "
-                           "xmlns:db='jabber:server:dialback' "
-                           "xmlns='jabber:server' "
-                           "to='xmpp.example.com'>")
+        self.xmlstream.dataReceived(self.headerVersion0)
         self.assertTrue(self.xmlstream._headerSent)
 
 
@@ -135,11 +129,7 @@ class XMPPServerListenAuthenticatorTest(unittest.TestCase):
         No features are sent in response to an XMPP < 1.0 stream header.
         """
         self.xmlstream.connectionMade()
-        self.xmlstream.dataReceived(
-            "<stream:stream xmlns:stream='http://etherx.jabber.org/streams' "
-                           "xmlns:db='jabber:server:dialback' "
-                           "xmlns='jabber:server' "
-                           "to='xmpp.example.com'>")
+        self.xmlstream.dataReceived(self.headerVersion0)
         self.assertEqual(1, len(self.output))
 
 
@@ -148,12 +138,7 @@ class XMPPServerListenAuthenticatorTest(unittest.TestCase):
         Features are sent in response to an XMPP >= 1.0 stream header.
         """
         self.xmlstream.connectionMade()
-        self.xmlstream.dataReceived(
-            "<stream:stream xmlns:stream='http://etherx.jabber.org/streams' "
-                           "xmlns:db='jabber:server:dialback' "
-                           "xmlns='jabber:server' "
-                           "to='xmpp.example.com' "
-                           "version='1.0'>")
+        self.xmlstream.dataReceived(self.headerVersion1)
         self.assertEqual(2, len(self.output))
         features = self.output[-1]
         self.assertEqual(NS_STREAMS, features.uri)